@@ -1,7 +1,12 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from asset_manifest import record_outputs
+
 # Configurar el generador de números aleatorios para consistencia
 np.random.seed(42)
 
@@ -135,5 +140,7 @@ def main():
         summary_df = pd.DataFrame(summary_data)
         summary_df.to_excel(writer, sheet_name='Summary', index=False)
 
+    record_outputs(['social_media_metrics.xlsx'])
+
 if __name__ == "__main__":
     main()
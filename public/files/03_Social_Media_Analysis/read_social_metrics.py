@@ -0,0 +1,135 @@
+"""
+Social Media Workbook Reader
+Loads sheets of social_media_metrics.xlsx concurrently into typed DataFrames,
+reading only the requested sheets and columns
+
+    from read_social_metrics import read_workbook
+    frames = read_workbook(sheets=['Instagram', 'Summary'],
+                           columns={'Instagram': ['Date', 'Followers']})
+
+Usage (from 03_Social_Media_Analysis):
+    python read_social_metrics.py [workbook.xlsx] [sheet ...]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import openpyxl
+import pandas as pd
+
+WORKBOOK = 'social_media_metrics.xlsx'
+
+# Cell text that stands for "no value" (e.g. Posts and Completion_Rate use 'N/A')
+PLACEHOLDERS = {'', 'N/A', 'NA', 'n/a', '-', '—'}
+
+
+def list_sheets(path=WORKBOOK):
+    """Sheet names, without parsing any sheet contents"""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def read_sheet(path, sheet, columns=None):
+    """Read one sheet with read-only, values-only iteration
+
+    Only the column range spanning the requested columns is parsed into values.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet]
+        header = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        names = [str(name) if name is not None else f'Unnamed_{i}' for i, name in enumerate(header)]
+
+        if columns is None:
+            wanted = list(range(len(names)))
+        else:
+            missing = [column for column in columns if column not in names]
+            if missing:
+                raise KeyError(f"{sheet}: no column(s) {', '.join(missing)}")
+            wanted = [names.index(column) for column in columns]
+
+        if not wanted:
+            return pd.DataFrame()
+
+        first, last = min(wanted), max(wanted)
+        offsets = [i - first for i in wanted]
+        rows = [
+            [row[i] if i < len(row) else None for i in offsets]
+            for row in worksheet.iter_rows(min_row=2, min_col=first + 1, max_col=last + 1, values_only=True)
+            if any(value is not None for value in row)
+        ]
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame.from_records(rows, columns=[names[i] for i in wanted])
+    return _apply_types(df)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _apply_types(df):
+    """Turn openpyxl's Python values into proper column dtypes
+
+    Placeholder text becomes NaN, so a column of numbers with a few 'N/A'
+    cells is numeric rather than object.
+    """
+    df = df.map(lambda value: None if isinstance(value, str) and value.strip() in PLACEHOLDERS else value)
+    for column in df.columns:
+        values = df[column].dropna()
+        if column.lower() in ('date', 'datetime'):
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+        elif len(values) and values.map(_is_number).all():
+            df[column] = pd.to_numeric(df[column])
+    return df.infer_objects()
+
+
+def _columns_for(columns, sheet):
+    if columns is None:
+        return None
+    if isinstance(columns, dict):
+        return columns.get(sheet)
+    return list(columns)
+
+
+def read_workbook(path=WORKBOOK, sheets=None, columns=None, max_workers=None):
+    """Read several sheets concurrently, one worker process per sheet
+
+    sheets:  sheet names to read (default: all)
+    columns: list applied to every sheet, or {sheet: [columns]}
+    Returns {sheet: DataFrame} in the requested order.
+    """
+    sheets = list_sheets(path) if sheets is None else list(sheets)
+    if not sheets:
+        return {}
+
+    # openpyxl parsing is pure Python, so sheets are spread over processes
+    # rather than threads; a single sheet is not worth the pool start-up
+    workers = min(len(sheets), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return {sheet: read_sheet(path, sheet, _columns_for(columns, sheet)) for sheet in sheets}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {sheet: pool.submit(read_sheet, path, sheet, _columns_for(columns, sheet))
+                   for sheet in sheets}
+        return {sheet: future.result() for sheet, future in futures.items()}
+
+
+def main():
+    """Print a summary of each sheet"""
+    path = sys.argv[1] if len(sys.argv) > 1 else WORKBOOK
+    sheets = sys.argv[2:] or None
+
+    frames = read_workbook(path, sheets)
+    for sheet, df in frames.items():
+        print(f"\n[{sheet}] {len(df)} rows")
+        print(df.dtypes.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -7,21 +7,67 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from asset_manifest import record_outputs
+from optimize_images import optimize_images
+import chart_data
+from voice_scoring import score_voice
 
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 8)
 plt.rcParams['font.size'] = 10
 
+# Radar axis labels, in voice_scoring.VOICE_DIMENSIONS order
+VOICE_CATEGORIES = ['Formality\n(Inverted)', 'Authenticity', 'Personality',
+                    'Relatability', 'Energy', 'Humor', 'Emotional\nTone', 'Consistency']
+
+# Institutions drawn on the radar chart (chart_data.json carries all of them)
+RADAR_INSTITUTIONS = ['YU', 'NYU', 'Columbia', 'Maryland']
+RADAR_COLORS = {'YU': '#4285F4', 'NYU': '#EA4335', 'Columbia': '#FBBC04', 'Maryland': '#34A853'}
+
+def save_chart(fig, output, dpi=300, width=None):
+    """Write a finished chart to a file name or file-like object and close it"""
+    if width:
+        dpi = width / fig.get_size_inches()[0]
+    plt.savefig(output, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    if isinstance(output, str):
+        print(f"✓ Created: {output}")
+
 def load_data():
     """Load content coding data"""
     df = pd.read_csv('content_coding_data.csv')
     return df
 
-def create_content_category_chart(df):
-    """Chart 1: Content Category Distribution by Institution"""
+def get_category_distribution(df):
+    """Share of each institution's posts per content category (%)"""
     category_counts = df.groupby(['Institution', 'Content_Category']).size().unstack(fill_value=0)
-    category_pct = category_counts.div(category_counts.sum(axis=1), axis=0) * 100
+    return category_counts.div(category_counts.sum(axis=1), axis=0) * 100
+
+def get_tone_distribution(df):
+    """Share of each institution's posts per tone (%)"""
+    tone_counts = df.groupby(['Institution', 'Tone']).size().unstack(fill_value=0)
+    return tone_counts.div(tone_counts.sum(axis=1), axis=0) * 100
+
+def get_format_engagement(df):
+    """Mean engagement rate per institution and format"""
+    return df.groupby(['Institution', 'Format'])['Engagement_Rate'].mean().unstack()
+
+def get_production_quality(df):
+    """Mean production quality per institution and format"""
+    return df.groupby(['Institution', 'Format'])['Production_Quality'].mean().unstack()
+
+def get_platform_engagement(df):
+    """Mean engagement rate per institution and platform"""
+    return df.groupby(['Institution', 'Platform'])['Engagement_Rate'].mean().unstack()
+
+def create_content_category_chart(df, output='chart_content_categories.png', dpi=300, width=None):
+    """Chart 1: Content Category Distribution by Institution"""
+    category_pct = get_category_distribution(df)
 
     fig, ax = plt.subplots(figsize=(14, 8))
     category_pct.T.plot(kind='bar', ax=ax, width=0.8)
@@ -32,13 +78,11 @@ def create_content_category_chart(df):
     ax.grid(axis='y', alpha=0.3)
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig('chart_content_categories.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_content_categories.png")
+    save_chart(fig, output, dpi, width)
 
-def create_voice_tone_comparison(df):
+def create_voice_tone_comparison(df, output='chart_tone_distribution.png', dpi=300, width=None):
     """Chart 2: Tone Distribution by Institution"""
-    tone_counts = df.groupby(['Institution', 'Tone']).size().unstack(fill_value=0)
-    tone_pct = tone_counts.div(tone_counts.sum(axis=1), axis=0) * 100
+    tone_pct = get_tone_distribution(df)
 
     fig, ax = plt.subplots(figsize=(12, 8))
     tone_pct.plot(kind='bar', ax=ax, stacked=True, colormap='Set3')
@@ -49,12 +93,11 @@ def create_voice_tone_comparison(df):
     ax.grid(axis='y', alpha=0.3)
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig('chart_tone_distribution.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_tone_distribution.png")
+    save_chart(fig, output, dpi, width)
 
-def create_format_performance(df):
+def create_format_performance(df, output='chart_format_performance.png', dpi=300, width=None):
     """Chart 3: Engagement Rate by Content Format"""
-    format_engagement = df.groupby(['Institution', 'Format'])['Engagement_Rate'].mean().unstack()
+    format_engagement = get_format_engagement(df)
 
     fig, ax = plt.subplots(figsize=(14, 8))
     format_engagement.plot(kind='bar', ax=ax, width=0.8)
@@ -66,12 +109,11 @@ def create_format_performance(df):
     ax.axhline(y=2.99, color='red', linestyle='--', alpha=0.7, label='Industry Benchmark')
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig('chart_format_performance.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_format_performance.png")
+    save_chart(fig, output, dpi, width)
 
-def create_production_quality_heatmap(df):
+def create_production_quality_heatmap(df, output='chart_production_quality.png', dpi=300, width=None):
     """Chart 4: Production Quality Heatmap"""
-    quality_avg = df.groupby(['Institution', 'Format'])['Production_Quality'].mean().unstack()
+    quality_avg = get_production_quality(df)
 
     fig, ax = plt.subplots(figsize=(10, 8))
     sns.heatmap(quality_avg, annot=True, fmt='.1f', cmap='RdYlGn',
@@ -81,33 +123,34 @@ def create_production_quality_heatmap(df):
     ax.set_xlabel('Content Format', fontsize=12)
     ax.set_ylabel('Institution', fontsize=12)
     plt.tight_layout()
-    plt.savefig('chart_production_quality.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_production_quality.png")
+    save_chart(fig, output, dpi, width)
 
-def create_voice_characteristics_radar():
+def get_voice_scores(df, institutions=None):
+    """Brand voice scores for the radar, limited to the institutions present"""
+    scores = score_voice(df)
+    if institutions is not None:
+        scores = scores.loc[[inst for inst in institutions if inst in scores.index]]
+    return scores
+
+def create_voice_characteristics_radar(df, output='chart_voice_radar.png', dpi=300, width=None):
     """Chart 5: Brand Voice Characteristics Radar Chart"""
-    # Data from research
-    categories = ['Formality\n(Inverted)', 'Authenticity', 'Personality',
-                  'Relatability', 'Energy', 'Humor', 'Emotional\nTone', 'Consistency']
-
-    institutions = {
-        'YU': [2.5, 6.0, 5.5, 5.2, 6.0, 3.5, 6.5, 7.8],  # Formality inverted for visual clarity
-        'NYU': [5.8, 8.5, 8.8, 8.6, 9.0, 8.5, 8.2, 8.0],
-        'Columbia': [4.2, 7.8, 7.5, 7.2, 7.0, 6.5, 7.8, 8.5],
-        'Maryland': [6.0, 8.2, 8.5, 8.4, 8.8, 8.2, 7.8, 7.5]
-    }
+    categories = VOICE_CATEGORIES
+    institutions = get_voice_scores(df, RADAR_INSTITUTIONS)
+    if institutions.empty:
+        institutions = get_voice_scores(df)
 
     angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
     angles += angles[:1]
 
     fig, ax = plt.subplots(figsize=(12, 12), subplot_kw=dict(projection='polar'))
 
-    colors = {'YU': '#4285F4', 'NYU': '#EA4335', 'Columbia': '#FBBC04', 'Maryland': '#34A853'}
-
-    for inst, values in institutions.items():
+    palette = plt.cm.tab10.colors
+    for i, (inst, scores) in enumerate(institutions.iterrows()):
+        values = scores.tolist()
         values += values[:1]
-        ax.plot(angles, values, 'o-', linewidth=2, label=inst, color=colors[inst])
-        ax.fill(angles, values, alpha=0.15, color=colors[inst])
+        color = RADAR_COLORS.get(inst, palette[i % len(palette)])
+        ax.plot(angles, values, 'o-', linewidth=2, label=inst, color=color)
+        ax.fill(angles, values, alpha=0.15, color=color)
 
     ax.set_xticks(angles[:-1])
     ax.set_xticklabels(categories, size=11)
@@ -120,12 +163,11 @@ def create_voice_characteristics_radar():
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('chart_voice_radar.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_voice_radar.png")
+    save_chart(fig, output, dpi, width)
 
-def create_platform_engagement_comparison(df):
+def create_platform_engagement_comparison(df, output='chart_platform_engagement.png', dpi=300, width=None):
     """Chart 6: Platform-specific Engagement Rates"""
-    platform_engagement = df.groupby(['Institution', 'Platform'])['Engagement_Rate'].mean().unstack()
+    platform_engagement = get_platform_engagement(df)
 
     fig, ax = plt.subplots(figsize=(12, 8))
     platform_engagement.plot(kind='bar', ax=ax, width=0.7)
@@ -136,8 +178,7 @@ def create_platform_engagement_comparison(df):
     ax.grid(axis='y', alpha=0.3)
     plt.xticks(rotation=0)
     plt.tight_layout()
-    plt.savefig('chart_platform_engagement.png', dpi=300, bbox_inches='tight')
-    print("✓ Created: chart_platform_engagement.png")
+    save_chart(fig, output, dpi, width)
 
 def create_summary_statistics(df):
     """Generate summary statistics table"""
@@ -159,6 +200,46 @@ def create_summary_statistics(df):
     summary.to_csv('summary_statistics.csv')
     print("✓ Created: summary_statistics.csv")
 
+def export_chart_data(df, output='chart_data.json'):
+    """Export the prepared data and encoding of every chart as compact JSON"""
+    def matrix_chart(kind, title, frame, x_label, y_label, legend, **extra):
+        spec = {'type': kind, 'title': title, 'legend': legend,
+                'x': {'label': x_label, 'categories': chart_data.values(frame.index)},
+                'y': {'label': y_label},
+                'series': chart_data.frame_series(frame)}
+        spec.update(extra)
+        return spec
+
+    quality_avg = get_production_quality(df)
+    voice_scores = get_voice_scores(df)
+    charts = {
+        'content_categories': matrix_chart(
+            'bar', 'Content Category Distribution by Institution', get_category_distribution(df).T,
+            'Content Category', 'Percentage of Posts (%)', 'Institution'),
+        'tone_distribution': matrix_chart(
+            'stacked_bar', 'Tone Distribution Across Institutions', get_tone_distribution(df),
+            'Institution', 'Percentage of Posts (%)', 'Tone'),
+        'format_performance': matrix_chart(
+            'bar', 'Average Engagement Rate by Content Format', get_format_engagement(df),
+            'Institution', 'Engagement Rate (%)', 'Format',
+            referenceLines=[chart_data.reference_line('value', 2.99, 'Industry Benchmark')]),
+        'production_quality': {
+            'type': 'heatmap', 'title': 'Production Quality Scores by Institution and Format',
+            'x': {'label': 'Content Format', 'categories': chart_data.values(quality_avg.columns)},
+            'y': {'label': 'Institution', 'categories': chart_data.values(quality_avg.index)},
+            'values': [chart_data.values(row) for row in quality_avg.to_numpy()],
+            'domain': [6, 10], 'colorLabel': 'Quality Score'},
+        'voice_radar': {
+            'type': 'radar', 'title': 'Brand Voice Characteristics Comparison (Scale: 1-10)',
+            'axes': list(voice_scores.columns),
+            'domain': [0, 10],
+            'series': [chart_data.series(inst, scores) for inst, scores in voice_scores.iterrows()]},
+        'platform_engagement': matrix_chart(
+            'bar', 'Average Engagement Rate by Platform', get_platform_engagement(df),
+            'Institution', 'Engagement Rate (%)', 'Platform'),
+    }
+    chart_data.write_chart_data(charts, output)
+
 def main():
     """Main execution function"""
     print("\n" + "="*80)
@@ -170,18 +251,31 @@ def main():
     df = load_data()
     print(f"✓ Loaded {len(df)} content samples\n")
 
+    if '--export-data' in sys.argv:
+        print("Exporting chart data...\n")
+        export_chart_data(df)
+        record_outputs(['chart_data.json'])
+        return
+
     # Generate all charts
     print("Generating visualizations...\n")
     create_content_category_chart(df)
     create_voice_tone_comparison(df)
     create_format_performance(df)
     create_production_quality_heatmap(df)
-    create_voice_characteristics_radar()
+    create_voice_characteristics_radar(df)
     create_platform_engagement_comparison(df)
 
     # Generate summary stats
-    print("\nGenerating summary statistics...")
+    print("\nGenerating summary statistics and chart data...")
     create_summary_statistics(df)
+    export_chart_data(df)
+    outputs = ['chart_content_categories.png', 'chart_tone_distribution.png',
+               'chart_format_performance.png', 'chart_production_quality.png',
+               'chart_voice_radar.png', 'chart_platform_engagement.png',
+               'summary_statistics.csv', 'chart_data.json']
+    optimize_images(outputs)
+    record_outputs(outputs)
 
     print("\n" + "="*80)
     print("✓ ALL VISUALIZATIONS GENERATED SUCCESSFULLY!")
@@ -194,6 +288,7 @@ def main():
     print("  • chart_voice_radar.png")
     print("  • chart_platform_engagement.png")
     print("  • summary_statistics.csv")
+    print("  • chart_data.json")
     print("\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,367 @@
+"""
+Content Coding Data Ingestion
+Merges a coder's batch into content_coding_data.csv keyed by Post_ID, keeping a
+persistent Post_ID index and per-institution aggregates up to date
+
+New posts are appended without rewriting the file, corrected posts are upserted
+in place, and duplicate or out-of-range rows are rejected. The index is a SQLite
+file (content_coding_data.index.sqlite), so lookups and updates touch only the
+batch's keys; the aggregates behind summary_statistics.csv only fold in the rows
+that changed, and medians are re-read from an index for those institutions only.
+
+Usage (from 04_Qualitative_Research):
+    python ingest_coding_data.py new_batch.csv            # append, reject known Post_IDs
+    python ingest_coding_data.py corrections.csv --upsert # replace known Post_IDs
+    python ingest_coding_data.py --rebuild                # rebuild the index from the CSV
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from asset_manifest import record_outputs
+
+DATA_FILE = 'content_coding_data.csv'
+INDEX_FILE = 'content_coding_data.index.sqlite'
+SUMMARY_FILE = 'summary_statistics.csv'
+
+COLUMNS = ['Post_ID', 'Institution', 'Platform', 'Date', 'Content_Category', 'Format',
+           'Tone', 'Voice', 'Visual_Style', 'Messaging_Approach', 'Production_Quality',
+           'Engagement_Rate', 'Likes', 'Comments', 'Shares']
+PRODUCTION_QUALITY_SCALE = (1.0, 10.0)
+COUNT_COLUMNS = ['Likes', 'Comments', 'Shares']
+
+# Metrics summarised per institution, matching create_summary_statistics()
+SUMMARY_METRICS = {
+    'Engagement_Rate': ['mean', 'median', 'std'],
+    'Production_Quality': ['mean', 'median'],
+    'Likes': ['mean'],
+    'Comments': ['mean'],
+    'Shares': ['mean'],
+}
+MEDIAN_METRICS = [metric for metric, stats in SUMMARY_METRICS.items() if 'median' in stats]
+
+# SQLite parameter limit is 999 on older builds
+QUERY_CHUNK = 500
+
+# Bumped when the tables change; an index with another version is recreated
+SCHEMA_VERSION = 2
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS posts (
+    Post_ID TEXT NOT NULL PRIMARY KEY,
+    Position INTEGER NOT NULL,
+    Institution TEXT NOT NULL,
+    {', '.join(f'{metric} REAL' for metric in SUMMARY_METRICS)}
+);
+{''.join(f'CREATE INDEX IF NOT EXISTS posts_{metric} ON posts (Institution, {metric});' for metric in MEDIAN_METRICS)}
+CREATE TABLE IF NOT EXISTS aggregates (
+    Institution TEXT,
+    Metric TEXT,
+    Count INTEGER NOT NULL,
+    Total REAL NOT NULL,
+    Total_Sq REAL NOT NULL,
+    Median REAL,
+    PRIMARY KEY (Institution, Metric)
+);
+"""
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), QUERY_CHUNK):
+        yield values[start:start + QUERY_CHUNK]
+
+
+def fold_rows(conn, rows, sign=1):
+    """Add (sign=1) or remove (sign=-1) rows' contributions to the aggregates
+
+    Returns the institutions touched, whose medians need refreshing.
+    """
+    if rows.empty:
+        return set()
+    grouped = rows.groupby('Institution', sort=False)[list(SUMMARY_METRICS)]
+    count = grouped.size()
+    total = grouped.sum()
+    total_sq = (rows[list(SUMMARY_METRICS)] ** 2).groupby(rows['Institution'], sort=False).sum()
+    conn.executemany(
+        """INSERT INTO aggregates (Institution, Metric, Count, Total, Total_Sq) VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT (Institution, Metric) DO UPDATE SET
+               Count = Count + excluded.Count,
+               Total = Total + excluded.Total,
+               Total_Sq = Total_Sq + excluded.Total_Sq""",
+        [(institution, metric, sign * int(count[institution]),
+          sign * float(total.at[institution, metric]), sign * float(total_sq.at[institution, metric]))
+         for institution in count.index for metric in SUMMARY_METRICS])
+    return set(count.index)
+
+
+def refresh_medians(conn, institutions):
+    """Recompute medians of some institutions from the (Institution, metric) indexes"""
+    conn.execute("DELETE FROM aggregates WHERE Count <= 0")
+    for institution in institutions:
+        for metric in MEDIAN_METRICS:
+            row = conn.execute("SELECT Count FROM aggregates WHERE Institution = ? AND Metric = ?",
+                               (institution, metric)).fetchone()
+            if row is None:
+                continue
+            n = row[0]
+            middle = conn.execute(
+                f"SELECT {metric} FROM posts WHERE Institution = ? ORDER BY {metric} LIMIT ? OFFSET ?",
+                (institution, 2 - n % 2, (n - 1) // 2)).fetchall()
+            conn.execute("UPDATE aggregates SET Median = ? WHERE Institution = ? AND Metric = ?",
+                         (float(np.mean([value for value, in middle])), institution, metric))
+
+
+def summary_from_aggregates(conn):
+    """summary_statistics table computed from the cached aggregates"""
+    aggregates = pd.read_sql_query("SELECT * FROM aggregates", conn).set_index(['Institution', 'Metric'])
+    data = {}
+    for metric, stats in SUMMARY_METRICS.items():
+        rows = aggregates.xs(metric, level='Metric').sort_index()
+        n = rows['Count']
+        mean = rows['Total'] / n
+        for stat in stats:
+            if stat == 'mean':
+                data[(metric, stat)] = mean
+            elif stat == 'median':
+                data[(metric, stat)] = rows['Median']
+            else:
+                variance = ((rows['Total_Sq'] - n * mean ** 2) / (n - 1)).where(n > 1)
+                data[(metric, stat)] = np.sqrt(variance.clip(lower=0.0))
+    summary = pd.DataFrame(data)
+    summary.index.name = 'Institution'
+    return summary.round(2)
+
+
+def validate_batch(batch):
+    """Split a batch into (valid, rejected); rejected rows carry a Reason column"""
+    missing = [column for column in COLUMNS if column not in batch.columns]
+    if missing:
+        raise ValueError(f"Batch is missing column(s): {', '.join(missing)}")
+
+    batch = batch[COLUMNS].copy()
+    # Test for missing IDs before astype(str): recent pandas keeps NaN as NaN
+    missing_id = batch['Post_ID'].isna()
+    batch['Post_ID'] = batch['Post_ID'].astype(str).str.strip()
+    dates = pd.to_datetime(batch['Date'], errors='coerce')
+    quality = pd.to_numeric(batch['Production_Quality'], errors='coerce')
+    engagement = pd.to_numeric(batch['Engagement_Rate'], errors='coerce')
+    counts = batch[COUNT_COLUMNS].apply(pd.to_numeric, errors='coerce')
+
+    low, high = PRODUCTION_QUALITY_SCALE
+    checks = [
+        ('missing Post_ID', missing_id | batch['Post_ID'].isin(['', 'nan', 'None'])),
+        ('missing Institution', batch['Institution'].isna()),
+        ('invalid Date', dates.isna()),
+        (f'Production_Quality outside {low:g}-{high:g}', ~quality.between(low, high)),
+        ('negative or missing Engagement_Rate', ~(engagement >= 0)),
+        ('negative or missing Likes/Comments/Shares', ~(counts >= 0).all(axis=1)),
+        ('duplicate Post_ID in batch', ~missing_id & batch['Post_ID'].duplicated(keep=False)),
+    ]
+
+    reasons = pd.Series('', index=batch.index)
+    for reason, failed in checks:
+        reasons[failed] = np.where(reasons[failed] == '', reason, reasons[failed] + '; ' + reason)
+    bad = reasons != ''
+
+    batch['Date'] = dates.dt.strftime('%Y-%m-%d')
+    batch['Production_Quality'] = quality
+    batch['Engagement_Rate'] = engagement
+    batch[COUNT_COLUMNS] = counts
+    valid = batch[~bad].copy()
+    valid[COUNT_COLUMNS] = valid[COUNT_COLUMNS].astype('int64')
+    rejected = batch[bad].assign(Reason=reasons[bad])
+    return valid, rejected
+
+
+def _csv_rows(df):
+    """Rows formatted exactly as pandas writes them to the data file"""
+    buffer = io.StringIO()
+    df[COLUMNS].to_csv(buffer, header=False, index=False, lineterminator='\n')
+    return list(csv.reader(io.StringIO(buffer.getvalue())))
+
+
+class CodingDataStore:
+    """content_coding_data.csv plus its persistent Post_ID index and aggregates"""
+
+    def __init__(self, data_file=DATA_FILE, index_file=INDEX_FILE):
+        self.data_file = data_file
+        self.index_file = index_file
+        self.conn = sqlite3.connect(index_file)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS posts; "
+                                    "DROP TABLE IF EXISTS aggregates;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(SCHEMA)
+        self.load()
+
+    def load(self):
+        """Use the saved index if it still matches the CSV, else rebuild it"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if row is None or row[0] != _file_signature(self.data_file):
+            self.rebuild()
+
+    def rebuild(self):
+        """Index every row of the CSV (the only full read)"""
+        df = pd.read_csv(self.data_file)
+        missing = df['Post_ID'].isna()
+        if missing.any():
+            rows = ', '.join(str(row + 2) for row in df.index[missing])
+            raise ValueError(f"{self.data_file} has rows without a Post_ID (line(s) {rows})")
+        duplicates = df.loc[df['Post_ID'].duplicated(), 'Post_ID'].unique()
+        if len(duplicates):
+            raise ValueError(f"{self.data_file} has duplicate Post_ID(s): {', '.join(map(str, duplicates))}")
+        with self.conn:
+            self.conn.execute("DELETE FROM posts")
+            self.conn.execute("DELETE FROM aggregates")
+            self._insert_posts(df, start=0)
+            refresh_medians(self.conn, fold_rows(self.conn, df))
+            self._save_signature()
+        print(f"[OK] Indexed {len(df)} posts from {self.data_file}")
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def _save_signature(self):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)",
+                          (_file_signature(self.data_file),))
+
+    def _insert_posts(self, df, start):
+        columns = ['Post_ID', 'Institution'] + list(SUMMARY_METRICS)
+        records = df[columns].astype({metric: float for metric in SUMMARY_METRICS})
+        self.conn.executemany(
+            f"INSERT INTO posts (Position, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+            ((start + offset, *record) for offset, record in enumerate(records.itertuples(index=False))))
+
+    def _indexed(self, post_ids):
+        """Indexed rows (Post_ID -> Position, Institution, metrics) of some Post_IDs"""
+        columns = ['Post_ID', 'Position', 'Institution'] + list(SUMMARY_METRICS)
+        found = []
+        for chunk in _chunks(post_ids):
+            found.extend(self.conn.execute(
+                f"SELECT {', '.join(columns)} FROM posts WHERE Post_ID IN ({', '.join('?' * len(chunk))})",
+                chunk))
+        return pd.DataFrame(found, columns=columns).set_index('Post_ID')
+
+    def _append(self, new):
+        """Append new rows at the end of the file without rewriting it"""
+        with open(self.data_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size:
+                f.seek(-1, os.SEEK_END)
+            needs_newline = size > 0 and f.read(1) != b'\n'
+        with open(self.data_file, 'a', newline='', encoding='utf-8') as f:
+            if needs_newline:
+                f.write('\n')
+            csv.writer(f, lineterminator='\n').writerows(_csv_rows(new))
+        self._insert_posts(new, start=self.count())
+
+    def _replace(self, updates, positions):
+        """Swap indexed rows for their corrections
+
+        Rows have variable width, so this rewrites the CSV; it is the one step
+        that is proportional to the file rather than the batch.
+        """
+        replacements = dict(zip(positions, _csv_rows(updates)))
+        with open(self.data_file, newline='', encoding='utf-8') as f:
+            lines = list(csv.reader(f))
+        header, body = lines[0], lines[1:]
+        for position, row in replacements.items():
+            body[position] = row
+
+        tmp_path = self.data_file + '.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(header)
+            writer.writerows(body)
+        os.replace(tmp_path, self.data_file)
+
+        self.conn.executemany(
+            f"UPDATE posts SET Institution = ?, {', '.join(f'{metric} = ?' for metric in SUMMARY_METRICS)} "
+            "WHERE Post_ID = ?",
+            ((row.Institution, *(float(getattr(row, metric)) for metric in SUMMARY_METRICS), row.Post_ID)
+             for row in updates.itertuples(index=False)))
+
+    def ingest(self, batch, upsert=False):
+        """Merge a batch; returns (added, updated, rejected DataFrame)"""
+        valid, rejected = validate_batch(batch)
+
+        # Keyed lookups against the index, so the cost follows the batch size
+        indexed = self._indexed(valid['Post_ID'])
+        known = valid['Post_ID'].isin(indexed.index)
+        new, updates = valid[~known], valid[known]
+        if not upsert and not updates.empty:
+            rejected = pd.concat([rejected, updates.assign(Reason='Post_ID already coded')])
+            updates = updates.iloc[0:0]
+        if new.empty and updates.empty:
+            return 0, 0, rejected
+
+        with self.conn:
+            touched = set()
+            if not updates.empty:
+                previous = indexed.loc[updates['Post_ID']].reset_index()
+                touched |= fold_rows(self.conn, previous, sign=-1)
+                self._replace(updates, previous['Position'])
+                touched |= fold_rows(self.conn, updates)
+            if not new.empty:
+                self._append(new)
+                touched |= fold_rows(self.conn, new)
+            refresh_medians(self.conn, touched)
+            self._save_signature()
+        return len(new), len(updates), rejected
+
+    def summary(self):
+        return summary_from_aggregates(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """Main execution function"""
+    print("\n" + "="*80)
+    print("CONTENT CODING DATA INGESTION")
+    print("="*80 + "\n")
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    store = CodingDataStore()
+    if '--rebuild' in sys.argv:
+        store.rebuild()
+    if not args:
+        store.close()
+        return
+
+    added = updated = 0
+    for batch_file in args:
+        batch_added, batch_updated, rejected = store.ingest(pd.read_csv(batch_file),
+                                                            upsert='--upsert' in sys.argv)
+        added += batch_added
+        updated += batch_updated
+        print(f"[OK] {batch_file}: {batch_added} added, {batch_updated} updated, {len(rejected)} rejected")
+        for _, row in rejected.iterrows():
+            print(f"  [REJECTED] {row['Post_ID']}: {row['Reason']}")
+
+    if added or updated:
+        store.summary().to_csv(SUMMARY_FILE)
+        print(f"[OK] {SUMMARY_FILE}")
+        record_outputs([DATA_FILE, SUMMARY_FILE])
+    print(f"\n{store.count()} coded posts")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
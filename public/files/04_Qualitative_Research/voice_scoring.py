@@ -0,0 +1,120 @@
+"""
+Brand Voice Scoring Engine
+Scores the eight brand-voice dimensions of the radar chart per institution from
+the coded Tone, Voice, Visual_Style and Messaging_Approach of its posts
+
+Each coded attribute has a weight table (category -> 1-10 score per dimension).
+Posts are scored in one vectorized pass by looking up their category codes in
+those tables, then averaged per institution. Consistency is not a per-post
+quality; it measures how concentrated an institution's coding is.
+
+    from voice_scoring import score_voice
+    scores = score_voice(df)        # DataFrame: Institution x VOICE_DIMENSIONS
+"""
+
+import numpy as np
+import pandas as pd
+
+VOICE_DIMENSIONS = ['Formality (Inverted)', 'Authenticity', 'Personality',
+                    'Relatability', 'Energy', 'Humor', 'Emotional Tone', 'Consistency']
+POST_DIMENSIONS = VOICE_DIMENSIONS[:-1]
+
+# Category scores per dimension, in POST_DIMENSIONS order (1 = low, 10 = high).
+# Formality is inverted: formal categories score low.
+WEIGHT_TABLES = {
+    'Tone': {
+        'Formal':        [1.5, 4.0, 3.0, 3.0, 3.0, 1.5, 4.0],
+        'Semi-formal':   [4.0, 5.5, 5.0, 5.0, 5.0, 3.0, 5.0],
+        'Casual':        [8.0, 8.0, 7.5, 8.5, 7.5, 6.0, 6.5],
+        'Humorous':      [9.0, 8.0, 9.0, 8.5, 8.5, 9.5, 7.0],
+        'Celebratory':   [7.0, 7.5, 8.0, 7.5, 9.5, 6.0, 9.0],
+        'Inspirational': [5.0, 7.0, 7.0, 6.5, 7.5, 3.0, 9.0],
+    },
+    'Voice': {
+        'Institutional': [2.0, 3.5, 3.5, 3.0, 4.0, 2.5, 4.0],
+        'Faculty':       [4.0, 6.0, 5.5, 5.0, 5.0, 3.5, 5.5],
+        'Student':       [8.0, 9.0, 8.5, 9.0, 8.0, 7.5, 7.5],
+        'Alumni':        [6.0, 8.0, 7.0, 7.0, 6.0, 5.0, 8.0],
+        'Mixed':         [6.0, 7.0, 7.0, 7.0, 7.0, 6.0, 7.0],
+    },
+    'Visual_Style': {
+        'Professional':  [3.0, 4.5, 5.0, 4.5, 5.0, 3.5, 5.0],
+        'Staged':        [3.5, 3.5, 4.5, 4.0, 5.0, 4.0, 4.5],
+        'Candid':        [8.0, 9.0, 8.0, 8.5, 8.0, 7.0, 7.5],
+        'Behind-scenes': [7.5, 9.0, 7.5, 8.5, 6.5, 6.0, 7.0],
+        'Documentary':   [5.0, 8.0, 6.5, 7.0, 6.0, 4.0, 8.5],
+    },
+    'Messaging_Approach': {
+        'Feature-focused':     [2.5, 4.0, 4.0, 3.5, 4.5, 2.5, 4.0],
+        'Promotional':         [3.0, 3.5, 4.5, 4.0, 6.0, 3.5, 4.5],
+        'Value-proposition':   [3.5, 5.0, 4.5, 5.0, 5.0, 3.0, 5.0],
+        'Educational':         [4.0, 6.0, 5.0, 5.5, 5.0, 3.5, 5.0],
+        'Story-driven':        [6.5, 8.5, 8.0, 8.0, 6.5, 5.0, 8.5],
+        'Day-in-life':         [8.0, 9.0, 8.0, 9.0, 7.0, 6.0, 7.0],
+        'Emotional':           [6.0, 8.0, 7.5, 7.5, 6.5, 3.5, 9.5],
+        'Interactive':         [8.0, 7.5, 8.0, 8.5, 8.0, 7.0, 7.0],
+        'Question-based':      [7.5, 7.0, 7.5, 8.0, 7.0, 6.5, 6.5],
+        'Community-building':  [7.0, 8.0, 7.5, 8.5, 7.0, 5.5, 8.0],
+        'Trend-participation': [9.0, 7.5, 9.0, 8.5, 9.5, 9.0, 7.0],
+        'Challenge':           [8.5, 7.0, 8.5, 8.0, 9.5, 8.5, 7.0],
+    },
+}
+
+# How much each attribute counts towards each dimension, in POST_DIMENSIONS order
+ATTRIBUTE_WEIGHTS = {
+    'Tone':               [3, 1, 2, 1, 2, 3, 2],
+    'Voice':              [2, 2, 1, 3, 1, 1, 1],
+    'Visual_Style':       [1, 3, 1, 1, 1, 1, 1],
+    'Messaging_Approach': [1, 2, 2, 2, 2, 2, 3],
+}
+
+VOICE_COLUMNS = list(WEIGHT_TABLES)
+
+
+def _score_table(column):
+    """Weight table of one attribute as a (categories, scores) pair"""
+    table = WEIGHT_TABLES[column]
+    return pd.Index(list(table)), np.array(list(table.values()), dtype=float)
+
+
+def score_posts(df):
+    """Per-post scores for the seven post-level dimensions
+
+    Categories missing from a weight table carry no signal; a post's score on
+    a dimension is the weighted mean over the attributes that were recognised.
+    """
+    total = np.zeros((len(df), len(POST_DIMENSIONS)))
+    weight = np.zeros_like(total)
+    for column in VOICE_COLUMNS:
+        categories, scores = _score_table(column)
+        codes = pd.Categorical(df[column], categories=categories).codes
+        known = (codes >= 0)[:, None]
+        attribute_weight = np.array(ATTRIBUTE_WEIGHTS[column], dtype=float)
+        total += np.where(known, scores[codes] * attribute_weight, 0.0)
+        weight += known * attribute_weight
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        post_scores = total / weight
+    return pd.DataFrame(post_scores, index=df.index, columns=POST_DIMENSIONS)
+
+
+def consistency_scores(df):
+    """1-10 score from the average share of each attribute's most used category"""
+    shares = []
+    for column in VOICE_COLUMNS:
+        counts = df.groupby(['Institution', column], observed=True).size()
+        by_institution = counts.groupby(level='Institution', observed=True)
+        shares.append(by_institution.max() / by_institution.sum())
+    return 1 + 9 * pd.concat(shares, axis=1).mean(axis=1)
+
+
+def score_voice(df):
+    """Brand voice scores (1-10) per institution, one column per VOICE_DIMENSIONS entry"""
+    scores = score_posts(df).groupby(df['Institution'].to_numpy(), sort=True).mean()
+    scores['Consistency'] = consistency_scores(df)
+    scores.index.name = 'Institution'
+    return scores[VOICE_DIMENSIONS].clip(1, 10).round(1)
+
+
+if __name__ == "__main__":
+    print(score_voice(pd.read_csv('content_coding_data.csv')).to_string())
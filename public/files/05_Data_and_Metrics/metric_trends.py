@@ -0,0 +1,218 @@
+"""
+Metric Trend and Anomaly Detection
+Rolling statistics per institution over instagram_metrics.csv: EWMA, rolling
+mean/std and least-squares slope of engagement rate and follower growth, with
+flags for snapshots that break the recent trend and for benchmark crossings
+
+Every statistic is derived from a handful of running window sums, so the full
+history is computed with grouped rolling sums and TrendTracker can fold in one
+new snapshot per institution in O(1). compute_trends is cached by frame content,
+so the charts, alerts and chart data of one run share a single pass.
+
+    trends = compute_trends(df_insta)     # one row per date, institution and metric
+    alerts = build_alerts(trends)         # compact alerts table
+
+    tracker = TrendTracker()
+    tracker.update_frame(df_insta)        # prime with history...
+    tracker.update(date, 'YU', followers=15200, engagement_rate=1.52)   # ...then per snapshot
+"""
+
+import collections
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK = 2.99        # industry engagement rate benchmark (%)
+WINDOW = 6              # snapshots per rolling window
+EWMA_SPAN = 3
+MIN_PERIODS = 4         # window points needed before anomalies are flagged
+Z_THRESHOLD = 3.0
+# Residual noise floor as a share of the window mean, so near-perfect trends
+# do not turn rounding into anomalies
+STD_FLOOR = 0.02
+
+TREND_METRICS = ['Engagement_Rate', 'Follower_Growth']
+
+TREND_INPUTS = ['Date', 'Institution', 'Followers', 'Engagement_Rate']
+
+CACHE_SIZE = 8
+
+_cache = collections.OrderedDict()
+
+TREND_COLUMNS = ['Date', 'Institution', 'Metric', 'Value', 'EWMA', 'Rolling_Mean', 'Rolling_Std',
+                 'Slope', 'Expected', 'Z_Score', 'Anomaly', 'Crossing']
+
+
+def window_stats(n, sk, skk, sy, syy, sky):
+    """Mean, std, slope, residual std and next-point forecast from window sums
+
+    k is the snapshot position and y the value; works on scalars and arrays.
+    """
+    n = np.asarray(n, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sy / n
+        k_mean = sk / n
+        sxx = skk - sk * k_mean
+        sxy = sky - sk * mean
+        syy_c = np.maximum(syy - sy * mean, 0.0)
+        std = np.where(n > 1, np.sqrt(syy_c / (n - 1)), np.nan)
+        slope = np.where((n > 1) & (sxx > 0), sxy / sxx, np.nan)
+        residual = np.where(n > 2, np.sqrt(np.maximum(syy_c - slope * sxy, 0.0) / (n - 2)), np.nan)
+        residual = np.maximum(residual, STD_FLOOR * np.abs(mean))
+        # Next snapshot sits one position after the last one in the window
+        forecast = mean + slope * (n + 1) / 2
+    return mean, std, slope, residual, forecast
+
+
+def metric_series(df):
+    """Long (Date, Institution, Metric, Value) frame of the tracked metrics"""
+    df = df.sort_values(['Institution', 'Date'])
+    growth = df.groupby('Institution', sort=False, observed=True)['Followers'].pct_change() * 100
+    series = pd.concat([
+        df[['Date', 'Institution']].assign(Metric='Engagement_Rate', Value=df['Engagement_Rate']),
+        df[['Date', 'Institution']].assign(Metric='Follower_Growth', Value=growth),
+    ])
+    series['Institution'] = series['Institution'].astype(str)
+    return series.dropna(subset=['Value']).sort_values(['Institution', 'Metric', 'Date'],
+                                                        ignore_index=True)
+
+
+def compute_trends(df):
+    """Rolling trend statistics and flags for the whole history (cached by content)"""
+    hashed = pd.util.hash_pandas_object(df[TREND_INPUTS], index=False).values
+    key = hashlib.sha1(hashed.tobytes()).hexdigest()
+    if key not in _cache:
+        _cache[key] = _compute_trends(df)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache.move_to_end(key)
+    # Callers get their own copy so the cached frame cannot be modified
+    return _cache[key].copy()
+
+
+def _compute_trends(df):
+    series = metric_series(df)
+    keys = [series['Institution'], series['Metric']]
+    y = series['Value'].to_numpy(dtype=float)
+    k = series.groupby(keys, sort=False).cumcount().to_numpy(dtype=float)
+
+    terms = pd.DataFrame({'n': 1.0, 'sk': k, 'skk': k * k, 'sy': y, 'syy': y * y, 'sky': k * y})
+    sums = terms.groupby(keys, sort=False).rolling(WINDOW, min_periods=1).sum()
+    sums = sums.reset_index(level=[0, 1], drop=True).sort_index()
+    mean, std, slope, _, _ = window_stats(*(sums[col].to_numpy() for col in terms.columns))
+
+    # Each point is tested against the window that ends just before it
+    previous = sums.groupby(keys, sort=False).shift(1)
+    prev_n = previous['n'].to_numpy()
+    _, _, _, residual, expected = window_stats(*(previous[col].to_numpy() for col in terms.columns))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_score = (y - expected) / residual
+    anomaly = (prev_n >= MIN_PERIODS) & (np.abs(z_score) >= Z_THRESHOLD)
+
+    above = pd.Series(y >= BENCHMARK, index=series.index)
+    was_above = above.groupby(keys, sort=False).shift(1)
+    crossed = (series['Metric'] == 'Engagement_Rate') & was_above.notna() & (above != was_above)
+    crossing = np.where(crossed, np.where(above, 'above', 'below'), '')
+
+    ewma = series.groupby(keys, sort=False)['Value'].transform(
+        lambda values: values.ewm(span=EWMA_SPAN, adjust=False).mean())
+
+    trends = series.assign(EWMA=ewma, Rolling_Mean=mean, Rolling_Std=std, Slope=slope,
+                           Expected=expected, Z_Score=z_score, Anomaly=anomaly, Crossing=crossing)
+    return trends[TREND_COLUMNS].sort_values(['Date', 'Institution', 'Metric'], ignore_index=True)
+
+
+def build_alerts(trends):
+    """Compact table of anomalies and benchmark crossings, newest first"""
+    flagged = trends[trends['Anomaly'] | (trends['Crossing'] != '')].copy()
+    messages = []
+    for row in flagged.itertuples():
+        parts = []
+        if row.Anomaly:
+            direction = 'spike' if row.Z_Score > 0 else 'drop'
+            parts.append(f"{row.Metric.replace('_', ' ')} {direction} (z={row.Z_Score:+.1f})")
+        if row.Crossing:
+            parts.append(f"Crossed {row.Crossing} {BENCHMARK}% benchmark")
+        messages.append('; '.join(parts))
+    flagged['Alert'] = messages
+    columns = ['Date', 'Institution', 'Metric', 'Value', 'Expected', 'Z_Score', 'Alert']
+    return flagged[columns].sort_values(['Date', 'Institution'], ascending=[False, True],
+                                        ignore_index=True)
+
+
+class _SeriesState:
+    """Running window sums, EWMA and benchmark side of one institution's metric"""
+
+    def __init__(self, window, alpha):
+        self.window = collections.deque()
+        self.size = window
+        self.alpha = alpha
+        self.count = 0
+        self.sums = np.zeros(6)      # n, sk, skk, sy, syy, sky
+        self.ewma = None
+        self.above = None
+
+    def update(self, value):
+        n = self.sums[0]
+        _, _, _, residual, expected = window_stats(*self.sums)
+        z_score = (value - expected) / residual if n > 2 else np.nan
+
+        k = float(self.count)
+        self.window.append((k, value))
+        self.sums += [1.0, k, k * k, value, value * value, k * value]
+        if len(self.window) > self.size:
+            old_k, old_value = self.window.popleft()
+            self.sums -= [1.0, old_k, old_k * old_k, old_value, old_value * old_value, old_k * old_value]
+        self.count += 1
+
+        self.ewma = value if self.ewma is None else self.alpha * value + (1 - self.alpha) * self.ewma
+        mean, std, slope, _, _ = window_stats(*self.sums)
+
+        above = value >= BENCHMARK
+        crossing = '' if self.above is None or above == self.above else ('above' if above else 'below')
+        self.above = above
+        return {'Value': value, 'EWMA': self.ewma, 'Rolling_Mean': float(mean),
+                'Rolling_Std': float(std), 'Slope': float(slope), 'Expected': float(expected),
+                'Z_Score': float(z_score),
+                'Anomaly': bool(n >= MIN_PERIODS and abs(z_score) >= Z_THRESHOLD),
+                'Crossing': crossing}
+
+
+class TrendTracker:
+    """Incremental version of compute_trends: O(1) work per new snapshot"""
+
+    def __init__(self, window=WINDOW, span=EWMA_SPAN):
+        self.window = window
+        self.alpha = 2 / (span + 1)
+        self.states = {}
+        self.last_followers = {}
+
+    def _state(self, institution, metric):
+        key = (institution, metric)
+        if key not in self.states:
+            self.states[key] = _SeriesState(self.window, self.alpha)
+        return self.states[key]
+
+    def update(self, date, institution, followers, engagement_rate):
+        """Fold in one snapshot; returns its trend rows (one per metric)"""
+        rows = []
+        state = self._state(institution, 'Engagement_Rate')
+        row = state.update(float(engagement_rate))
+        rows.append({'Date': date, 'Institution': institution, 'Metric': 'Engagement_Rate', **row})
+
+        previous = self.last_followers.get(institution)
+        self.last_followers[institution] = followers
+        if previous:
+            row = self._state(institution, 'Follower_Growth').update((followers / previous - 1) * 100)
+            row['Crossing'] = ''
+            rows.append({'Date': date, 'Institution': institution, 'Metric': 'Follower_Growth', **row})
+        return rows
+
+    def update_frame(self, df):
+        """Fold in a batch of snapshots in date order"""
+        rows = []
+        for snapshot in df.sort_values('Date').itertuples(index=False):
+            rows.extend(self.update(snapshot.Date, str(snapshot.Institution),
+                                    snapshot.Followers, snapshot.Engagement_Rate))
+        return pd.DataFrame(rows, columns=TREND_COLUMNS)
@@ -0,0 +1,185 @@
+"""
+Peer Gap Engine
+Computes every institution's gap to every peer group on every metric and
+snapshot date of instagram_metrics.csv
+
+The result is an institution x peer group x metric x date tensor. Only the
+value grid and per-group sums are stored; charts and report tables ask for
+slices, which are broadcast from those on demand. A peer group average never
+includes the institution being compared.
+
+    tensor = build_gap_tensor(df_insta)
+    tensor.comparison('YU', 'Market Leaders')     # metric rows, latest date
+    tensor.matrix('Engagement_Rate')              # institution x peer group gaps
+"""
+
+import collections
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+GAP_METRICS = ['Followers', 'Engagement_Rate', 'Posts_This_Week', 'Video_Percentage']
+
+METRIC_LABELS = {
+    'Followers': 'Followers',
+    'Engagement_Rate': 'Engagement Rate',
+    'Posts_This_Week': 'Posts/Week',
+    'Video_Percentage': 'Video Content %',
+}
+
+MARKET_LEADERS = ['NYU', 'Columbia', 'Maryland']
+
+CACHE_SIZE = 8
+
+_cache = collections.OrderedDict()
+
+
+def default_peer_groups(institutions):
+    """Named groups plus one single-institution group per peer (all pairs)"""
+    groups = {'Market Leaders': MARKET_LEADERS, 'All Institutions': list(institutions)}
+    groups.update({inst: [inst] for inst in institutions})
+    return groups
+
+
+class GapTensor:
+    """Peer-group averages and gaps on (institution, peer group, metric, date) axes
+
+    gap = peer average - institution value, gap_pct = gap as % of the value.
+    Nothing of size institutions x groups is stored: a single-institution group
+    is that institution's values, and other groups keep (metric, date) sums and
+    counts from which each institution's own contribution is subtracted.
+    """
+
+    FIELDS = ['peer_avg', 'gap', 'gap_pct']
+
+    def __init__(self, institutions, groups, metrics, dates, values, membership):
+        self.institutions = pd.Index(institutions, name='Institution')
+        self.groups = pd.Index(groups, name='Peer_Group')
+        self.metrics = pd.Index(metrics, name='Metric')
+        self.dates = pd.DatetimeIndex(dates, name='Date')
+        self.values = values        # (institution, metric, date)
+
+        sizes = membership.sum(axis=1)
+        self._single = np.flatnonzero(sizes == 1)
+        self._single_member = membership[self._single].argmax(axis=1)
+        self._pooled = np.flatnonzero(sizes != 1)
+        self._membership = membership[self._pooled]     # (pooled group, institution)
+
+        present = ~np.isnan(values)
+        self._sum = np.einsum('gi,imd->gmd', self._membership, np.where(present, values, 0.0))
+        self._count = np.einsum('gi,imd->gmd', self._membership, present.astype(float))
+
+    def _positions(self, index, selection):
+        return np.arange(len(index)) if selection is None else np.asarray(selection)
+
+    def peer_average(self, institutions=None, metrics=None, dates=None):
+        """(institution, group, metric, date) peer averages for lists of positions (None = all)"""
+        i = self._positions(self.institutions, institutions)
+        m = self._positions(self.metrics, metrics)
+        d = self._positions(self.dates, dates)
+        values = self.values[np.ix_(i, m, d)]
+        average = np.empty((len(i), len(self.groups), len(m), len(d)))
+
+        # Single-institution groups: the member's values, except against itself
+        average[:, self._single] = self.values[np.ix_(self._single_member, m, d)][None]
+        rows, cols = np.nonzero(i[:, None] == self._single_member[None, :])
+        average[rows, self._single[cols]] = np.nan
+
+        # Other groups: leave the institution's own contribution out of the sums
+        own = self._membership[:, i].T[:, :, None, None]
+        present = ~np.isnan(values)
+        pooled = np.arange(len(self._pooled))
+        peer_sum = self._sum[np.ix_(pooled, m, d)][None] - own * np.where(present, values, 0.0)[:, None]
+        peer_count = self._count[np.ix_(pooled, m, d)][None] - own * present[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average[:, self._pooled] = np.where(peer_count > 0, peer_sum / peer_count, np.nan)
+        return average
+
+    def _fields(self, institutions=None, metrics=None, dates=None):
+        """Values plus every FIELDS array for a selection of positions"""
+        peer_avg = self.peer_average(institutions, metrics, dates)
+        values = self.values[np.ix_(self._positions(self.institutions, institutions),
+                                    self._positions(self.metrics, metrics),
+                                    self._positions(self.dates, dates))][:, None]
+        gap = peer_avg - values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gap_pct = gap / np.abs(values) * 100
+        return {'values': values, 'peer_avg': peer_avg, 'gap': gap, 'gap_pct': gap_pct}
+
+    def _date_position(self, date=None):
+        if date is None:
+            return len(self.dates) - 1
+        return self.dates.get_loc(pd.Timestamp(date))
+
+    def comparison(self, institution, group, date=None):
+        """One institution against one peer group: a row per metric"""
+        p = self.groups.get_loc(group)
+        fields = self._fields([self.institutions.get_loc(institution)], None, [self._date_position(date)])
+        return pd.DataFrame({
+            'Value': fields['values'][0, 0, :, 0],
+            'Peer_Average': fields['peer_avg'][0, p, :, 0],
+            'Gap': fields['gap'][0, p, :, 0],
+            'Gap_Pct': fields['gap_pct'][0, p, :, 0],
+        }, index=self.metrics)
+
+    def matrix(self, metric, date=None, field='gap'):
+        """Institution x peer group table of one metric on one date"""
+        if field not in self.FIELDS:
+            raise ValueError(f"field must be one of {', '.join(self.FIELDS)}")
+        fields = self._fields(None, [self.metrics.get_loc(metric)], [self._date_position(date)])
+        return pd.DataFrame(fields[field][:, :, 0, 0], index=self.institutions, columns=self.groups)
+
+    def to_frame(self, dates=None):
+        """Long-format report rows, optionally restricted to some dates"""
+        positions = (list(range(len(self.dates))) if dates is None
+                     else [self._date_position(date) for date in dates])
+        fields = self._fields(None, None, positions)
+        index = pd.MultiIndex.from_product(
+            [self.institutions, self.groups, self.metrics, self.dates[positions]])
+        frame = pd.DataFrame({
+            'Value': np.broadcast_to(fields['values'], fields['gap'].shape).ravel(),
+            'Peer_Average': fields['peer_avg'].ravel(),
+            'Gap': fields['gap'].ravel(),
+            'Gap_Pct': fields['gap_pct'].ravel(),
+        }, index=index).reset_index()
+        return frame.dropna(subset=['Peer_Average'])
+
+
+def _frame_key(df, metrics, peer_groups):
+    hashed = pd.util.hash_pandas_object(df[['Date', 'Institution'] + metrics], index=False).values
+    groups = repr(sorted((name, tuple(members)) for name, members in peer_groups.items()))
+    return hashlib.sha1(hashed.tobytes() + groups.encode() + ','.join(metrics).encode()).hexdigest()
+
+
+def build_gap_tensor(df, peer_groups=None, metrics=None):
+    """Gap tensor for a metrics frame (cached by content, groups and metrics)"""
+    metrics = list(metrics or GAP_METRICS)
+    institution_names = df['Institution'].astype(str)
+    institutions = list(pd.unique(institution_names))
+    peer_groups = peer_groups or default_peer_groups(institutions)
+
+    key = _frame_key(df, metrics, peer_groups)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    # (institution, metric, date) value grid; missing snapshots stay NaN
+    dates = np.sort(pd.unique(pd.to_datetime(df['Date'])))
+    inst_codes = pd.Categorical(institution_names, categories=institutions).codes
+    date_codes = pd.Categorical(pd.to_datetime(df['Date']), categories=dates).codes
+    values = np.full((len(institutions), len(metrics), len(dates)), np.nan)
+    values[inst_codes, :, date_codes] = df[metrics].to_numpy(dtype=float)
+
+    # (group, institution) membership, so group sums are one contraction
+    groups = list(peer_groups)
+    membership = np.zeros((len(groups), len(institutions)))
+    for g, members in enumerate(peer_groups.values()):
+        membership[g, [institutions.index(inst) for inst in members if inst in institutions]] = 1
+
+    tensor = GapTensor(institutions, groups, metrics, dates, values, membership)
+    _cache[key] = tensor
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return tensor
+
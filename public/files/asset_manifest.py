@@ -0,0 +1,139 @@
+"""
+Asset Manifest
+Records content hash, size, mtime and content type of generated outputs so
+server.js can answer conditional requests and serve hashed URLs immutably
+
+Usage (from public/files):
+    python asset_manifest.py               # rescan every file under public/files
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = 'asset-manifest.json'
+MANIFEST_PATH = os.path.join(BASE_DIR, MANIFEST_NAME)
+LOCK_PATH = MANIFEST_PATH + '.lock'
+
+# Kept in sync with the contentTypes table in server.js
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.csv': 'text/csv',
+    '.tex': 'text/plain',
+    '.bib': 'text/plain',
+    '.txt': 'text/plain',
+    '.json': 'application/json',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+
+def file_hash(path):
+    """First 16 hex digits of the file's SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def describe(path):
+    """Manifest entry for a single file"""
+    stat = os.stat(path)
+    ext = os.path.splitext(path)[1].lower()
+    return {
+        'hash': file_hash(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns // 1_000_000,
+        'contentType': CONTENT_TYPES.get(ext, 'application/octet-stream')
+    }
+
+
+def manifest_key(path):
+    """Manifest keys are the URL path below /api/files/"""
+    return os.path.relpath(os.path.abspath(path), BASE_DIR).replace(os.sep, '/')
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest):
+    """Write atomically so the server never reads a half-written manifest"""
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=1)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+@contextlib.contextmanager
+def manifest_lock():
+    """Exclusive lock around read-modify-write of the manifest
+
+    The watcher, generators and optimize_images.py can all record outputs at
+    the same time; without the lock the last writer drops the others' entries.
+    """
+    with open(LOCK_PATH, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def record_outputs(paths):
+    """Add or refresh manifest entries for files a generator just wrote"""
+    entries = {manifest_key(path): describe(path) for path in paths if os.path.isfile(path)}
+    with manifest_lock():
+        # Re-read under the lock so entries written meanwhile are kept
+        manifest = load_manifest()
+        manifest.update(entries)
+        save_manifest(manifest)
+
+
+def build_manifest():
+    """Rescan every file under public/files"""
+    manifest = {}
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+        for name in files:
+            if name.startswith(MANIFEST_NAME) or name.endswith(('.py', '.gz', '.br')):
+                continue
+            path = os.path.join(root, name)
+            manifest[manifest_key(path)] = describe(path)
+    with manifest_lock():
+        save_manifest(manifest)
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = build_manifest()
+    total = sum(entry['size'] for entry in manifest.values())
+    print(f"[OK] {MANIFEST_NAME}: {len(manifest)} files, {total / 1024 / 1024:.1f} MB")
@@ -0,0 +1,72 @@
+"""
+Chart Data Export Helpers
+Compact JSON encoding of the data behind each generated chart, so the web
+front end can draw charts itself instead of downloading 300 dpi PNGs
+
+A section bundle (chart_data.json) looks like:
+    {"charts": {"<chart_id>": {"type": "bar", "title": ..., "x": {...}, "y": {...},
+                               "series": [{"name": ..., "values": [...]}],
+                               "referenceLines": [...], "referenceBands": [...],
+                               "markers": [...]}}}
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+PRECISION = 4
+
+
+def clean_value(value):
+    """JSON-safe scalar: rounded floats, None for missing, ISO dates"""
+    if value is None:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        if math.isnan(value):
+            return None
+        value = round(float(value), PRECISION)
+        return int(value) if value.is_integer() else value
+    return str(value)
+
+
+def values(items):
+    return [clean_value(item) for item in items]
+
+
+def series(name, items):
+    return {'name': str(name), 'values': values(items)}
+
+
+def frame_series(frame):
+    """One series per column of a frame whose index is the category axis"""
+    return [series(column, frame[column]) for column in frame.columns]
+
+
+def reference_line(axis, value, label):
+    return {'axis': axis, 'value': value, 'label': label}
+
+
+def reference_band(axis, start, end, label):
+    return {'axis': axis, 'from': start, 'to': end, 'label': label}
+
+
+def marker(x, series_name, kind, label):
+    """A flagged point on one series (e.g. an anomaly or benchmark crossing)"""
+    return {'x': clean_value(x), 'series': str(series_name), 'kind': kind, 'label': label}
+
+
+def write_chart_data(charts, output='chart_data.json'):
+    """Write a section bundle of chart specs as compact JSON"""
+    payload = {'charts': charts}
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, output)
+    print(f"[OK] {output} ({os.path.getsize(output) / 1024:.1f} KB, {len(charts)} charts)")
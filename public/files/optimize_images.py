@@ -0,0 +1,184 @@
+"""
+Optimize Chart Images
+Re-encodes the generated PNG charts in place with maximum deflate effort,
+dropping unused alpha channels and switching to an exact palette when a chart
+has at most 256 colors. --quantize allows near-lossless palette reduction.
+
+Files whose hash matches the last optimization are skipped; sizes before and
+after are kept in image-optimization.json.
+
+Usage (from public/files):
+    python optimize_images.py                     # every PNG under public/files
+    python optimize_images.py --quantize 256      # near-lossless palette reduction
+    python optimize_images.py 05_Data_and_Metrics/chart_follower_growth.png
+"""
+
+import argparse
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from asset_manifest import BASE_DIR, file_hash, manifest_key, record_outputs
+
+REPORT_NAME = 'image-optimization.json'
+REPORT_PATH = os.path.join(BASE_DIR, REPORT_NAME)
+
+
+def load_report():
+    try:
+        with open(REPORT_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_report(report):
+    tmp_path = REPORT_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(report.items())), f, indent=1)
+    os.replace(tmp_path, REPORT_PATH)
+
+
+def exact_palette(image):
+    """Palette image with exactly the same pixels, or None above 256 colors"""
+    if image.getcolors(maxcolors=256) is None:
+        return None
+    pixels = np.asarray(image)
+    # Pack each pixel into one integer so the palette lookup is a 1-D unique
+    packed = np.zeros(pixels.shape[:2], dtype=np.uint32)
+    for channel in range(pixels.shape[-1]):
+        packed = (packed << 8) | pixels[..., channel]
+    codes, indices = np.unique(packed, return_inverse=True)
+    colors = np.stack([(codes >> (8 * shift)) & 0xFF
+                       for shift in reversed(range(pixels.shape[-1]))], axis=1)
+    palette = Image.fromarray(indices.reshape(pixels.shape[:2]).astype(np.uint8), 'P')
+    palette.putpalette(colors.astype(np.uint8).ravel().tolist(), rawmode=image.mode)
+    return palette
+
+
+def reduce_image(image, colors=None):
+    """Smallest-format equivalent of a chart image (approximate if colors is set)"""
+    if image.mode not in ('RGB', 'RGBA'):
+        return image
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema() == (255, 255):
+        image = image.convert('RGB')
+
+    if colors:
+        method = Image.Quantize.MEDIANCUT if image.mode == 'RGB' else Image.Quantize.FASTOCTREE
+        return image.quantize(colors=colors, method=method, dither=Image.Dither.NONE)
+    return exact_palette(image) or image
+
+
+def optimize_png(path, colors=None):
+    """Re-encode one PNG in place if that makes it smaller; returns (before, after)"""
+    before = os.path.getsize(path)
+    with Image.open(path) as image:
+        image.load()
+        dpi = image.info.get('dpi')
+    reduced = reduce_image(image, colors)
+
+    buffer = io.BytesIO()
+    options = {'optimize': True}
+    if dpi:
+        options['dpi'] = dpi
+    reduced.save(buffer, 'PNG', **options)
+    data = buffer.getvalue()
+    if len(data) >= before:
+        return before, before
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return before, len(data)
+
+
+def _optimize_task(path, colors):
+    before, after = optimize_png(path, colors)
+    return path, before, after, file_hash(path)
+
+
+def optimize_images(paths, colors=None, workers=None, force=False):
+    """Optimize PNGs in parallel, skipping files unchanged since their last pass
+
+    Returns [(path, before, after)] for the files that were processed.
+    """
+    report = load_report()
+    todo = []
+    unchanged = set()
+    for path in paths:
+        if not (path.lower().endswith('.png') and os.path.isfile(path)):
+            continue
+        entry = report.get(manifest_key(path))
+        if entry is not None and entry['hash'] == file_hash(path):
+            if not force and (not colors or entry.get('colors') == colors):
+                continue
+            unchanged.add(path)
+        todo.append(path)
+    if not todo:
+        return []
+
+    workers = min(len(todo), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [_optimize_task(path, colors) for path in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_optimize_task, todo, [colors] * len(todo)))
+
+    for path, before, after, digest in results:
+        key = manifest_key(path)
+        # Re-optimizing our own output (e.g. to quantize it) keeps the size
+        # it had when the generator wrote it
+        original = report[key]['original'] if path in unchanged else before
+        report[key] = {'hash': digest, 'original': original, 'size': after, 'colors': colors}
+    save_report(report)
+    return [(path, before, after) for path, before, after, _ in results]
+
+
+def find_pngs():
+    """Every PNG under public/files"""
+    paths = []
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+        paths.extend(os.path.join(root, name) for name in files if name.lower().endswith('.png'))
+    return sorted(paths)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Optimize generated PNG charts in place')
+    parser.add_argument('paths', nargs='*', help='PNG files (default: all under public/files)')
+    parser.add_argument('--quantize', type=int, nargs='?', const=256, metavar='COLORS',
+                        help='near-lossless palette reduction to COLORS colors (default 256)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='ignore the hash check')
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("OPTIMIZING CHART IMAGES")
+    print("="*80 + "\n")
+
+    paths = args.paths or find_pngs()
+    results = optimize_images(paths, colors=args.quantize, workers=args.workers, force=args.force)
+    for path, before, after in results:
+        change = (after - before) / before * 100 if before else 0
+        print(f"[OK] {manifest_key(path)}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB ({change:+.0f}%)")
+    record_outputs([path for path, before, after in results if after < before])
+
+    saved = sum(before - after for _, before, after in results)
+    report = load_report()
+    total_original = sum(entry['original'] for entry in report.values())
+    total_size = sum(entry['size'] for entry in report.values())
+    print(f"\n[OK] {len(results)} optimized, {len(paths) - len(results)} unchanged, "
+          f"{saved / 1024:.1f} KB saved this run")
+    if total_original:
+        print(f"[OK] {REPORT_NAME}: {total_original / 1024 / 1024:.1f} MB -> "
+              f"{total_size / 1024 / 1024:.1f} MB across {len(report)} images\n")
+
+
+if __name__ == "__main__":
+    main()
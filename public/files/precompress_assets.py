@@ -0,0 +1,95 @@
+"""
+Precompress Text Assets
+Writes .gz (and .br when the brotli package is installed) variants of the text
+files under public/files so server.js can serve them by Accept-Encoding
+
+Usage (from public/files):
+    python precompress_assets.py
+"""
+
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Binary formats (PDF, PNG, XLSX) are already compressed internally
+TEXT_EXTENSIONS = {'.csv', '.tex', '.bib', '.txt', '.json', '.bbl', '.toc', '.md'}
+
+# Keep a variant only if it saves at least this fraction of the original
+MIN_SAVING = 0.10
+
+
+def is_stale(source, variant):
+    return not os.path.exists(variant) or os.path.getmtime(variant) < os.path.getmtime(source)
+
+
+def write_variant(source, variant, data, compressed):
+    """Write a variant, or remove an old one if compression no longer pays off"""
+    if len(compressed) > len(data) * (1 - MIN_SAVING):
+        if os.path.exists(variant):
+            os.remove(variant)
+        return 0
+    tmp_path = variant + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(tmp_path, variant)
+    return len(data) - len(compressed)
+
+
+def compress_file(path):
+    """Create/refresh the .gz and .br variants of one file; returns bytes saved"""
+    if os.path.splitext(path)[1].lower() not in TEXT_EXTENSIONS:
+        return 0
+
+    targets = [(path + '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        targets.append((path + '.br', lambda data: brotli.compress(data, quality=11)))
+
+    saved = 0
+    data = None
+    for variant, compress in targets:
+        if not is_stale(path, variant):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        saved += write_variant(path, variant, data, compress(data))
+    return saved
+
+
+def compress_all():
+    """Precompress every text asset under public/files"""
+    count = 0
+    saved = 0
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+        for name in files:
+            if name.startswith(('asset-manifest', 'image-optimization')):
+                continue
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1].lower() in TEXT_EXTENSIONS:
+                count += 1
+                saved += compress_file(path)
+    return count, saved
+
+
+def main():
+    """Main execution function"""
+    print("\n" + "="*80)
+    print("PRECOMPRESSING TEXT ASSETS")
+    print("="*80 + "\n")
+
+    if brotli is None:
+        print("brotli not installed - writing .gz variants only (pip install brotli)\n")
+
+    count, saved = compress_all()
+    print(f"[OK] {count} text files checked, {saved / 1024:.1f} KB saved by new variants\n")
+
+
+if __name__ == "__main__":
+    main()
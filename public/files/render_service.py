@@ -0,0 +1,394 @@
+"""
+Chart Render Service
+Renders the generator charts on demand with custom parameters for the web
+front end. server.js proxies /api/charts/* here.
+
+Usage (from public/files):
+    python render_service.py                      # http://127.0.0.1:3002
+    python render_service.py --workers 4 --port 3002
+
+Endpoints:
+    GET /charts                   available chart ids and their parameters
+    GET /render/<chart_id>?focus=NYU&start=2025-03-01&end=2025-10-31&width=1200&dpi=100
+    GET /health
+"""
+
+import argparse
+import collections
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from shared_frames import SharedFrame, attach_frame, detach_frame
+from watch_artifacts import BASE_DIR, DEPENDENCIES, working_directory
+
+# chart id (e.g. 'follower_growth') -> (data file, generator function name)
+CHARTS = {
+    artifact[len('chart_'):-len('.png')]: (data_path, function_name)
+    for data_path, dependency in DEPENDENCIES.items()
+    for artifact, function_name, _ in dependency['artifacts']
+    if artifact.startswith('chart_') and artifact.endswith('.png')
+}
+
+DEFAULT_DPI = 100
+MIN_DPI, MAX_DPI = 50, 300
+MIN_WIDTH, MAX_WIDTH = 200, 4000
+
+
+class RenderError(ValueError):
+    """Invalid chart id or parameters (reported to the client as 400/404)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def load_generator(data_path):
+    """Import the generator module that owns a data file"""
+    section_dir = os.path.join(BASE_DIR, os.path.dirname(data_path))
+    if section_dir not in sys.path:
+        sys.path.insert(0, section_dir)
+    return importlib.import_module(DEPENDENCIES[data_path]['module'])
+
+
+def chart_params(chart_id):
+    """Query parameters a chart understands"""
+    data_path, function_name = CHARTS[chart_id]
+    function = getattr(load_generator(data_path), function_name)
+    params = ['start', 'end', 'dpi', 'width']
+    if 'focus' in inspect.signature(function).parameters:
+        params.insert(0, 'focus')
+    return params
+
+
+# -- worker processes -------------------------------------------------------
+
+# data file -> name of the shared block this worker is attached to
+_worker_blocks = {}
+
+
+def _worker_init():
+    """Import the generators once per worker (data arrives via shared memory)"""
+    for data_path in DEPENDENCIES:
+        load_generator(data_path)
+
+
+def _worker_frame(data_path, handle):
+    """Read-only view of the published frame, dropping any superseded block"""
+    previous = _worker_blocks.get(data_path)
+    if previous is not None and previous != handle['shm']:
+        detach_frame(previous)
+    _worker_blocks[data_path] = handle['shm']
+    return attach_frame(handle)
+
+
+def _worker_render(chart_id, params, handle):
+    """Render one chart to PNG bytes inside a worker"""
+    data_path, function_name = CHARTS[chart_id]
+    module = load_generator(data_path)
+    df = _worker_frame(data_path, handle)
+
+    if params.get('start'):
+        df = df[df['Date'] >= params['start']]
+    if params.get('end'):
+        df = df[df['Date'] <= params['end']]
+    if df.empty:
+        raise RenderError('No data in the requested date range')
+    if params.get('start') or params.get('end'):
+        # Text columns arrive as categoricals; keep filtered-out values out of groupbys
+        categorical = df.select_dtypes('category').columns
+        df = df.assign(**{col: df[col].cat.remove_unused_categories() for col in categorical})
+
+    function = getattr(module, function_name)
+    kwargs = {'output': io.BytesIO(), 'dpi': params['dpi'], 'width': params.get('width')}
+    if 'focus' in inspect.signature(function).parameters and params.get('focus'):
+        if params['focus'] not in set(df['Institution']):
+            raise RenderError(f"Unknown institution: {params['focus']}")
+        kwargs['focus'] = params['focus']
+
+    function(df, **kwargs)
+    return kwargs['output'].getvalue()
+
+
+# -- parent process ---------------------------------------------------------
+
+_digest_cache = {}
+_digest_lock = threading.Lock()
+
+
+def data_digest(data_path):
+    """SHA-256 of a data file, recomputed only when its mtime/size change"""
+    full_path = os.path.join(BASE_DIR, data_path)
+    stat = os.stat(full_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        cached = _digest_cache.get(data_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    with open(full_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    with _digest_lock:
+        _digest_cache[data_path] = (signature, digest)
+    return digest
+
+
+def parse_params(query):
+    """Validate and normalise query parameters into a hashable cache key part"""
+    def single(name):
+        values = query.get(name)
+        return values[-1].strip() if values else None
+
+    params = {}
+    if single('focus'):
+        params['focus'] = single('focus')
+    for name in ('start', 'end'):
+        value = single(name)
+        if value:
+            try:
+                params[name] = pd.Timestamp(value).strftime('%Y-%m-%d')
+            except ValueError:
+                raise RenderError(f'Invalid {name} date: {value}')
+    try:
+        params['dpi'] = min(max(int(single('dpi') or DEFAULT_DPI), MIN_DPI), MAX_DPI)
+        if single('width'):
+            params['width'] = min(max(int(single('width')), MIN_WIDTH), MAX_WIDTH)
+    except ValueError:
+        raise RenderError('dpi and width must be integers')
+    return params
+
+
+class LRUCache:
+    """Thread-safe LRU of rendered images bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries=256, max_bytes=128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = value
+            self.size += len(value)
+            while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+class RenderService:
+    """Worker pool plus result cache; identical concurrent requests share one render
+
+    Each data file is parsed once here and published to shared memory, so
+    workers attach to it instead of parsing or unpickling their own copy.
+    """
+
+    def __init__(self, workers=2, cache=None):
+        context = multiprocessing.get_context('spawn')
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                        initializer=_worker_init)
+        self.cache = cache or LRUCache()
+        self.in_flight = {}
+        self.shared = {}
+        # Tasks submitted with each block; a republished block is unlinked only
+        # once none of them are left
+        self.frame_users = collections.Counter()
+        self.retired = set()
+        self.lock = threading.Lock()
+        self.publish_lock = threading.Lock()
+        self.frame_lock = threading.Lock()
+
+    def acquire_frame(self, data_path, digest):
+        """Published frame for a data file, republished on change; release when done"""
+        with self.publish_lock:
+            current = self.shared.get(data_path)
+            if current is None or current[0] != digest:
+                module = load_generator(data_path)
+                with working_directory(os.path.join(BASE_DIR, os.path.dirname(data_path))):
+                    df = module.load_data()
+                df['Date'] = pd.to_datetime(df['Date'])
+                self.shared[data_path] = (digest, SharedFrame(df))
+                if current is not None:
+                    self._retire(current[1])
+
+            frame = self.shared[data_path][1]
+            with self.frame_lock:
+                self.frame_users[frame] += 1
+            return frame
+
+    def release_frame(self, frame):
+        """Drop one task's reference; unlinks a superseded block after its last task"""
+        with self.frame_lock:
+            self.frame_users[frame] -= 1
+            if self.frame_users[frame] > 0:
+                return
+            del self.frame_users[frame]
+            if frame not in self.retired:
+                return
+            self.retired.discard(frame)
+        frame.close()
+
+    def _retire(self, frame):
+        """Unlink a superseded block now, or once its queued and running tasks finish"""
+        with self.frame_lock:
+            if self.frame_users[frame] > 0:
+                self.retired.add(frame)
+                return
+            del self.frame_users[frame]
+        frame.close()
+
+    def render(self, chart_id, params):
+        """PNG bytes and ETag for a chart, from cache when possible"""
+        if chart_id not in CHARTS:
+            raise RenderError(f'Unknown chart: {chart_id}', status=404)
+
+        digest = data_digest(CHARTS[chart_id][0])
+        key = (chart_id, tuple(sorted(params.items())), digest)
+        etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:16] + '"'
+
+        image = self.cache.get(key)
+        if image is not None:
+            return image, etag
+
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is None:
+                frame = self.acquire_frame(CHARTS[chart_id][0], digest)
+                try:
+                    future = self.pool.submit(_worker_render, chart_id, params, frame.handle)
+                except Exception:
+                    self.release_frame(frame)
+                    raise
+                future.add_done_callback(lambda _, frame=frame: self.release_frame(frame))
+                self.in_flight[key] = future
+        try:
+            image = future.result()
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+        self.cache.put(key, image)
+        return image, etag
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
+        for _, shared in self.shared.values():
+            shared.close()
+        for frame in self.retired:
+            frame.close()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['health']:
+            return self._send_json(200, {'status': 'ok', 'cache': self.service.cache.stats()})
+
+        if parts == ['charts']:
+            charts = {}
+            for chart_id, (data_path, _) in sorted(CHARTS.items()):
+                charts[chart_id] = {'data': data_path.replace(os.sep, '/'),
+                                    'params': chart_params(chart_id)}
+            return self._send_json(200, charts)
+
+        if len(parts) != 2 or parts[0] != 'render':
+            return self._send_json(404, {'error': 'Not found'})
+
+        try:
+            params = parse_params(parse_qs(url.query))
+            image, etag = self.service.render(parts[1], params)
+        except RenderError as error:
+            return self._send_json(error.status, {'error': str(error)})
+        except Exception as error:
+            self.log_error('Render failed: %s', error)
+            return self._send_json(500, {'error': 'Render failed', 'message': str(error)})
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(image)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(image)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Serve generator charts rendered on demand')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3002)
+    parser.add_argument('--workers', type=int, default=2, help='render worker processes')
+    parser.add_argument('--cache-entries', type=int, default=256)
+    parser.add_argument('--cache-mb', type=int, default=128)
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("CHART RENDER SERVICE")
+    print("="*80 + "\n")
+
+    cache = LRUCache(max_entries=args.cache_entries, max_bytes=args.cache_mb * 1024 * 1024)
+    RenderRequestHandler.service = RenderService(workers=args.workers, cache=cache)
+    server = ThreadingHTTPServer((args.host, args.port), RenderRequestHandler)
+    # Exit through the finally block on SIGTERM too, so shared memory is released
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Serving {len(CHARTS)} charts on http://{args.host}:{args.port} "
+          f"with {args.workers} workers (Ctrl+C to stop)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping render service...")
+    finally:
+        server.server_close()
+        RenderRequestHandler.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Shared DataFrame Handoff
+Publishes a prepared DataFrame once into a multiprocessing.shared_memory block
+so worker processes can attach to it read-only instead of unpickling a copy
+
+Numeric and datetime columns are stored as raw arrays; text columns are stored
+as integer codes plus a small category dictionary that travels in the handle.
+Every column of an attached frame is a view over the block: for categoricals
+the codes array (df[col].array.codes) is shared and only the categories are
+per-process. Note that df[col].cat.codes returns a copy, so check sharing on
+.array.codes.
+
+    with SharedFrame(df) as shared:          # parent
+        pool.submit(work, shared.handle)
+
+    df = attach_frame(handle)                # worker, zero-copy and read-only
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+ALIGNMENT = 64
+
+# Worker-side cache of attached blocks: shm name -> (SharedMemory, DataFrame)
+_attached = {}
+
+
+def _codes_dtype(n_categories):
+    """Smallest code type, matching what pandas picks so from_codes need not copy"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _column_arrays(df):
+    """Split a frame into (name, kind, array, categories) column specs"""
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns.append((name, 'category', series.cat.codes.to_numpy(),
+                            list(series.cat.categories)))
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            values = series.to_numpy(dtype='datetime64[ns]')
+            columns.append((name, 'datetime64[ns]', values.view('int64'), None))
+        elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            columns.append((name, 'numeric', np.ascontiguousarray(series.to_numpy()), None))
+        else:
+            codes, categories = pd.factorize(series, sort=True)
+            codes = codes.astype(_codes_dtype(len(categories)))
+            columns.append((name, 'category', codes, list(categories)))
+    return columns
+
+
+class SharedFrame:
+    """Owner of a shared-memory copy of a DataFrame; unlinks it on close"""
+
+    def __init__(self, df):
+        columns = _column_arrays(df)
+        offsets = []
+        total = 0
+        for _, _, array, _ in columns:
+            offsets.append(total)
+            total += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        specs = []
+        for (name, kind, array, categories), offset in zip(columns, offsets):
+            target = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=offset)
+            target[:] = array
+            specs.append({'name': name, 'kind': kind, 'dtype': array.dtype.str,
+                          'offset': offset, 'categories': categories})
+
+        # Everything a worker needs to rebuild the frame; small enough to pickle per task
+        self.handle = {'shm': self.shm.name, 'rows': len(df), 'columns': specs}
+        self.nbytes = total
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_block(name):
+    """Attach to an existing block without taking ownership of its lifetime"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track flag. Pool workers share the publisher's
+        # resource tracker, so registering again does not change who unlinks.
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_frame(handle):
+    """Read-only DataFrame view over a published block (cached per process)
+
+    No column data is copied; the codes dtype written by SharedFrame is the
+    one from_codes expects, so categoricals keep the block as their codes.
+    """
+    cached = _attached.get(handle['shm'])
+    if cached is not None:
+        return cached[1]
+
+    shm = _open_block(handle['shm'])
+    rows = handle['rows']
+    data = {}
+    for spec in handle['columns']:
+        array = np.ndarray((rows,), dtype=np.dtype(spec['dtype']), buffer=shm.buf, offset=spec['offset'])
+        array.flags.writeable = False
+        if spec['kind'] == 'category':
+            data[spec['name']] = pd.Categorical.from_codes(array, categories=spec['categories'],
+                                                          validate=False)
+        elif spec['kind'] == 'numeric':
+            data[spec['name']] = array
+        else:
+            data[spec['name']] = array.view(spec['kind'])
+
+    df = pd.DataFrame(data, copy=False)
+    _attached[handle['shm']] = (shm, df)
+    return df
+
+
+def detach_frame(name):
+    """Drop a worker's view of a block that has been republished"""
+    cached = _attached.pop(name, None)
+    if cached is not None:
+        try:
+            cached[0].close()
+        except BufferError:
+            # Views are still referenced elsewhere; the mapping goes away with them
+            pass
@@ -0,0 +1,328 @@
+"""
+Artifact Watch Mode
+Watches the research data files and regenerates only the affected artifacts
+
+Usage (from public/files):
+    python watch_artifacts.py              # watch until Ctrl+C
+    python watch_artifacts.py --once       # rebuild stale/missing artifacts and exit
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import importlib
+import itertools
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import matplotlib
+matplotlib.use('Agg')  # rebuilds run on a background thread, never open a GUI backend
+
+import pandas as pd
+
+from asset_manifest import record_outputs
+from optimize_images import optimize_images
+from precompress_assets import compress_file
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Data file -> generator module and the artifacts it feeds.
+# Each artifact lists the columns its chart actually reads, so an edit that
+# does not touch those columns leaves the artifact alone.
+DEPENDENCIES = {
+    os.path.join('05_Data_and_Metrics', 'instagram_metrics.csv'): {
+        'module': 'generate_metric_charts',
+        'artifacts': [
+            ('chart_follower_growth.png', 'create_follower_growth_chart',
+             ['Date', 'Institution', 'Followers']),
+            ('chart_follower_comparison.png', 'create_follower_comparison_chart',
+             ['Date', 'Institution', 'Followers']),
+            ('chart_engagement_comparison.png', 'create_engagement_comparison_chart',
+             ['Date', 'Institution', 'Engagement_Rate']),
+            ('chart_engagement_trends.png', 'create_engagement_trends_chart',
+             ['Date', 'Institution', 'Engagement_Rate']),
+            ('chart_video_percentage.png', 'create_video_percentage_chart',
+             ['Date', 'Institution', 'Video_Percentage']),
+            ('chart_posting_frequency.png', 'create_posting_frequency_chart',
+             ['Date', 'Institution', 'Posts_This_Week']),
+            ('chart_performance_heatmap.png', 'create_performance_heatmap',
+             ['Date', 'Institution', 'Followers', 'Engagement_Rate',
+              'Posts_This_Week', 'Video_Percentage']),
+            ('chart_yu_gap_analysis.png', 'create_yu_gap_analysis',
+             ['Date', 'Institution', 'Followers', 'Engagement_Rate',
+              'Posts_This_Week', 'Video_Percentage']),
+            ('peer_gap_report.csv', 'create_peer_gap_report',
+             ['Date', 'Institution', 'Followers', 'Engagement_Rate',
+              'Posts_This_Week', 'Video_Percentage']),
+            ('trend_alerts.csv', 'create_trend_alerts',
+             ['Date', 'Institution', 'Followers', 'Engagement_Rate']),
+            ('chart_data.json', 'export_chart_data',
+             ['Date', 'Institution', 'Followers', 'Engagement_Rate',
+              'Posts_This_Week', 'Video_Percentage']),
+        ],
+    },
+    os.path.join('04_Qualitative_Research', 'content_coding_data.csv'): {
+        'module': 'generate_qualitative_charts',
+        'artifacts': [
+            ('chart_content_categories.png', 'create_content_category_chart',
+             ['Institution', 'Content_Category']),
+            ('chart_tone_distribution.png', 'create_voice_tone_comparison',
+             ['Institution', 'Tone']),
+            ('chart_format_performance.png', 'create_format_performance',
+             ['Institution', 'Format', 'Engagement_Rate']),
+            ('chart_production_quality.png', 'create_production_quality_heatmap',
+             ['Institution', 'Format', 'Production_Quality']),
+            ('chart_voice_radar.png', 'create_voice_characteristics_radar',
+             ['Institution', 'Tone', 'Voice', 'Visual_Style', 'Messaging_Approach']),
+            ('chart_platform_engagement.png', 'create_platform_engagement_comparison',
+             ['Institution', 'Platform', 'Engagement_Rate']),
+            ('summary_statistics.csv', 'create_summary_statistics',
+             ['Institution', 'Engagement_Rate', 'Production_Quality',
+              'Likes', 'Comments', 'Shares']),
+            ('chart_data.json', 'export_chart_data',
+             ['Institution', 'Content_Category', 'Tone', 'Voice', 'Visual_Style',
+              'Messaging_Approach', 'Format', 'Platform', 'Engagement_Rate',
+              'Production_Quality']),
+        ],
+    },
+}
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """Temporarily switch into a section folder (generators write relative paths)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def column_digest(df, columns):
+    """Content hash of the columns an artifact depends on"""
+    present = [c for c in columns if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[present], index=False).values
+    return hashlib.sha1(hashed.tobytes() + ','.join(present).encode()).hexdigest()
+
+
+def find_documents():
+    """Section LaTeX sources mapped to the PDFs they compile into"""
+    documents = {}
+    for tex_path in glob.glob(os.path.join(BASE_DIR, '*', '*.tex')):
+        documents[os.path.relpath(tex_path, BASE_DIR)] = os.path.splitext(tex_path)[0] + '.pdf'
+    return documents
+
+
+class ArtifactWatcher:
+    """Polls data and LaTeX sources and rebuilds dependents on a worker thread"""
+
+    def __init__(self, interval=0.5, debounce=1.0):
+        self.interval = interval
+        self.debounce = debounce
+        self.modules = {}
+        self.frames = {}
+        self.digests = {}
+        self.signatures = {}
+        self.pending = {}
+        self.documents = find_documents()
+        # Rebuilds run before queued image optimization passes
+        self.jobs = queue.PriorityQueue()
+        self.job_order = itertools.count()
+        self.worker = threading.Thread(target=self._run_jobs, daemon=True)
+
+    # -- data ---------------------------------------------------------------
+
+    def _module(self, data_path):
+        """Import (once) the generator module for a data file"""
+        name = DEPENDENCIES[data_path]['module']
+        if name not in self.modules:
+            section_dir = os.path.join(BASE_DIR, os.path.dirname(data_path))
+            if section_dir not in sys.path:
+                sys.path.insert(0, section_dir)
+            self.modules[name] = importlib.import_module(name)
+        return self.modules[name]
+
+    def _load(self, data_path):
+        """Parse a data file with its generator's loader and keep it in memory"""
+        module = self._module(data_path)
+        with working_directory(os.path.join(BASE_DIR, os.path.dirname(data_path))):
+            self.frames[data_path] = module.load_data()
+        return self.frames[data_path]
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(os.path.join(BASE_DIR, path))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    # -- rebuilds -----------------------------------------------------------
+
+    def rebuild_data(self, data_path, assume_current=False):
+        """Reload one data file and regenerate the artifacts whose inputs changed
+
+        With assume_current, artifacts written after the data file was last
+        modified are taken as up to date and only their input digests are
+        recorded; older or missing ones are rebuilt.
+        """
+        start = time.perf_counter()
+        try:
+            df = self._load(data_path)
+        except Exception as error:
+            print(f"[ERROR] Could not load {data_path}: {error}")
+            return
+
+        module = self._module(data_path)
+        section_dir = os.path.join(BASE_DIR, os.path.dirname(data_path))
+        data_mtime = os.path.getmtime(os.path.join(BASE_DIR, data_path))
+        rebuilt = []
+        with working_directory(section_dir):
+            for artifact, function_name, columns in DEPENDENCIES[data_path]['artifacts']:
+                digest = column_digest(df, columns)
+                key = (data_path, artifact)
+                if os.path.exists(artifact):
+                    if (assume_current and key not in self.digests
+                            and os.path.getmtime(artifact) >= data_mtime):
+                        self.digests[key] = digest
+                    if self.digests.get(key) == digest:
+                        continue
+                try:
+                    getattr(module, function_name)(df)
+                except Exception as error:
+                    print(f"[ERROR] {artifact}: {error}")
+                    continue
+                self.digests[key] = digest
+                rebuilt.append(os.path.join(section_dir, artifact))
+
+        if rebuilt:
+            for path in rebuilt:
+                compress_file(path)
+            record_outputs(rebuilt)
+        elapsed = time.perf_counter() - start
+        print(f"[OK] {data_path}: {len(rebuilt)} artifact(s) rebuilt in {elapsed:.2f}s")
+        return rebuilt
+
+    def optimize(self, paths):
+        """Second pass after a rebuild: shrink the new PNGs and record them again"""
+        start = time.perf_counter()
+        smaller = [path for path, before, after in optimize_images(paths) if after < before]
+        if smaller:
+            record_outputs(smaller)
+            elapsed = time.perf_counter() - start
+            print(f"[OK] {len(smaller)} image(s) optimized in {elapsed:.2f}s")
+
+    def rebuild_document(self, tex_path):
+        """Recompile a section PDF with latexmk (uses the shared latexmkrc)"""
+        latexmk = shutil.which('latexmk')
+        if latexmk is None:
+            print(f"[SKIP] {tex_path}: latexmk not found")
+            return
+        section_dir = os.path.join(BASE_DIR, os.path.dirname(tex_path))
+        command = [latexmk, '-pdf', '-r', os.path.join(BASE_DIR, 'latexmkrc'),
+                   os.path.basename(tex_path)]
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=section_dir, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode == 0:
+            record_outputs([self.documents[tex_path]])
+            print(f"[OK] {os.path.relpath(self.documents[tex_path], BASE_DIR)} in {elapsed:.2f}s")
+        else:
+            print(f"[ERROR] latexmk failed for {tex_path} (see {os.path.splitext(tex_path)[0]}.log)")
+
+    def queue_job(self, kind, target, priority=0):
+        self.jobs.put((priority, next(self.job_order), kind, target))
+
+    def _run_jobs(self):
+        while True:
+            _, _, kind, target = self.jobs.get()
+            if kind == 'optimize':
+                self.optimize(target)
+            elif target in DEPENDENCIES:
+                rebuilt = self.rebuild_data(target)
+                if rebuilt:
+                    # The artifacts are already served; optimizing can wait
+                    # behind any rebuild queued meanwhile
+                    self.queue_job('optimize', rebuilt, priority=1)
+            else:
+                self.rebuild_document(target)
+            self.jobs.task_done()
+
+    # -- watching -----------------------------------------------------------
+
+    def watched_paths(self):
+        return list(DEPENDENCIES) + list(self.documents)
+
+    def prime(self):
+        """Load every data file once and build anything missing or stale"""
+        for data_path in DEPENDENCIES:
+            self.signatures[data_path] = self._signature(data_path)
+            if self.signatures[data_path] is None:
+                print(f"[SKIP] {data_path}: not found")
+                continue
+            rebuilt = self.rebuild_data(data_path, assume_current=True)
+            if rebuilt:
+                self.optimize(rebuilt)
+        for tex_path, pdf_path in self.documents.items():
+            self.signatures[tex_path] = self._signature(tex_path)
+            tex_mtime = os.path.getmtime(os.path.join(BASE_DIR, tex_path))
+            if not os.path.exists(pdf_path) or os.path.getmtime(pdf_path) < tex_mtime:
+                self.rebuild_document(tex_path)
+
+    def poll(self):
+        """Detect changed files and queue them once they stop changing"""
+        now = time.monotonic()
+        for path in self.watched_paths():
+            signature = self._signature(path)
+            if signature != self.signatures.get(path):
+                self.signatures[path] = signature
+                if signature is not None:
+                    self.pending[path] = now
+
+        for path, changed_at in list(self.pending.items()):
+            if now - changed_at >= self.debounce:
+                del self.pending[path]
+                print(f"Change detected: {path}")
+                self.queue_job('rebuild', path)
+
+    def run(self):
+        self.prime()
+        self.worker.start()
+        print(f"\nWatching {len(self.watched_paths())} files (Ctrl+C to stop)...\n")
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("\nStopping watcher...")
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Regenerate research artifacts when their data changes')
+    parser.add_argument('--interval', type=float, default=0.5, help='polling interval in seconds')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help='seconds a file must stay unchanged before rebuilding')
+    parser.add_argument('--once', action='store_true',
+                        help='rebuild stale or missing artifacts and exit instead of watching')
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("ARTIFACT WATCH MODE")
+    print("="*80 + "\n")
+
+    watcher = ArtifactWatcher(interval=args.interval, debounce=args.debounce)
+    if args.once:
+        watcher.prime()
+    else:
+        watcher.run()
+
+
+if __name__ == "__main__":
+    main()
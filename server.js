@@ -2,6 +2,7 @@ const express = require('express');
 const cors = require('cors');
 const path = require('path');
 const fs = require('fs');
+const http = require('http');
 
 const app = express();
 const PORT = 3001;
@@ -17,10 +18,260 @@ const RESEARCH_DIR = path.join(__dirname, 'public', 'files');
 
 // Log startup info
 console.log('Research Directory:', RESEARCH_DIR);
-console.log('Directory exists:', fs.existsSync(RESEARCH_DIR));
+
+// Asset manifest written by the Python generators (public/files/asset_manifest.py):
+// relative path -> { hash, size, mtime, contentType }
+const MANIFEST_NAME = 'asset-manifest.json';
+const MANIFEST_PATH = path.join(RESEARCH_DIR, MANIFEST_NAME);
+let assetManifest = {};
+
+async function loadManifest() {
+  try {
+    assetManifest = JSON.parse(await fs.promises.readFile(MANIFEST_PATH, 'utf8'));
+    console.log('Loaded asset manifest:', Object.keys(assetManifest).length, 'entries');
+  } catch (error) {
+    assetManifest = {};
+  }
+}
+
+// File metadata cache over RESEARCH_DIR so requests never touch the disk
+// synchronously: relative path -> fs.Stats. Built once at startup with async
+// stat calls and kept current from fs.watch events.
+let fileIndex = new Map();
+let indexReady = false;
+let researchDirExists = false;
+let structureCache = {};
+
+// A full rescan fills a fresh Map and swaps it in when done, so requests keep
+// being served from the old one meanwhile.
+let pendingIndex = null;
+let rescanQueued = false;
+
+// One file rewrite fires several watch events whose stat calls can finish in
+// any order. Only the most recently started stat of a path may update it.
+const statSequence = new Map();
+
+function toRelative(filePath) {
+  return path.relative(RESEARCH_DIR, filePath).split(path.sep).join('/');
+}
+
+// Index a path (recursively for directories). Without a target Map the result
+// goes to the live index and to any rescan in progress.
+async function indexPath(relPath, target = null) {
+  const sequence = (statSequence.get(relPath) || 0) + 1;
+  statSequence.set(relPath, sequence);
+  const fullPath = path.join(RESEARCH_DIR, relPath);
+  let stats = null;
+  try {
+    stats = await fs.promises.stat(fullPath);
+  } catch (error) {
+    // Gone: handled below
+  }
+
+  if (statSequence.get(relPath) !== sequence) {
+    return;
+  }
+  const indexes = target ? [target] : [fileIndex, pendingIndex].filter(Boolean);
+
+  if (!stats) {
+    // Drop the entry and anything below it
+    for (const index of indexes) {
+      for (const key of index.keys()) {
+        if (key === relPath || key.startsWith(relPath + '/')) {
+          index.delete(key);
+        }
+      }
+    }
+    return;
+  }
+
+  indexes.forEach(index => index.set(relPath, stats));
+  if (stats.isDirectory()) {
+    const entries = await fs.promises.readdir(fullPath);
+    await Promise.all(entries.map(name => indexPath(relPath ? `${relPath}/${name}` : name, target)));
+  }
+}
+
+// Top-level folder -> entry names, as served by /api/debug/structure
+function buildStructure() {
+  const structure = {};
+  for (const [relPath, stats] of fileIndex) {
+    if (relPath && !relPath.includes('/') && stats.isDirectory()) {
+      structure[relPath] = [];
+    }
+  }
+  for (const relPath of fileIndex.keys()) {
+    const parts = relPath.split('/');
+    if (parts.length === 2 && structure[parts[0]]) {
+      structure[parts[0]].push(parts[1]);
+    }
+  }
+  Object.values(structure).forEach(names => names.sort());
+  structureCache = Object.fromEntries(Object.keys(structure).sort().map(key => [key, structure[key]]));
+}
+
+let structureTimer = null;
+function scheduleStructureRebuild() {
+  clearTimeout(structureTimer);
+  structureTimer = setTimeout(buildStructure, 100);
+}
+
+async function buildFileIndex() {
+  if (pendingIndex) {
+    // Already rescanning: go again once it finishes
+    rescanQueued = true;
+    return;
+  }
+  pendingIndex = new Map();
+  try {
+    await indexPath('', pendingIndex);
+    fileIndex = pendingIndex;
+  } finally {
+    pendingIndex = null;
+  }
+  researchDirExists = fileIndex.has('');
+  buildStructure();
+  indexReady = true;
+  console.log('Directory exists:', researchDirExists);
+  console.log('Indexed files:', fileIndex.size);
+
+  if (rescanQueued) {
+    rescanQueued = false;
+    await buildFileIndex();
+  }
+}
+
+function watchResearchDir() {
+  try {
+    fs.watch(RESEARCH_DIR, { recursive: true }, (eventType, filename) => {
+      if (!filename) {
+        // Platform could not tell us what changed: rescan everything
+        buildFileIndex().catch(error => console.error('Error indexing files:', error));
+        return;
+      }
+      const relPath = filename.split(path.sep).join('/');
+      indexPath(relPath)
+        .then(() => {
+          scheduleStructureRebuild();
+          if (relPath === MANIFEST_NAME) {
+            return loadManifest();
+          }
+        })
+        .catch(error => console.error('Error indexing', relPath, error));
+    });
+  } catch (error) {
+    console.error('File watching unavailable, metadata cache will not refresh:', error.message);
+  }
+}
+
+// Cached stats for a file path, falling back to an async stat until the index is built
+async function getFileStats(filePath) {
+  const relPath = toRelative(filePath);
+  if (indexReady) {
+    return fileIndex.get(relPath) || null;
+  }
+  try {
+    return await fs.promises.stat(filePath);
+  } catch (error) {
+    return null;
+  }
+}
+
+loadManifest();
+buildFileIndex()
+  .then(watchResearchDir)
+  .catch(error => console.error('Error indexing files:', error));
+
+// Manifest entry for a file, only if it still describes what is on disk
+function getManifestEntry(filePath, stats) {
+  const entry = assetManifest[toRelative(filePath)];
+  if (!entry || entry.size !== stats.size || Math.abs(entry.mtime - stats.mtimeMs) >= 1) {
+    return null;
+  }
+  return entry;
+}
+
+// Evaluate If-None-Match (weak comparison) / If-Modified-Since against a validator
+function isNotModified(req, etag, mtime) {
+  const ifNoneMatch = req.headers['if-none-match'];
+  if (ifNoneMatch) {
+    const opaque = etag.replace(/^W\//, '');
+    return ifNoneMatch.split(',').some(tag => {
+      const value = tag.trim().replace(/^W\//, '');
+      return value === '*' || value === opaque;
+    });
+  }
+
+  const ifModifiedSince = Date.parse(req.headers['if-modified-since']);
+  return !isNaN(ifModifiedSince) && Math.floor(mtime / 1000) * 1000 <= ifModifiedSince;
+}
+
+// Precompressed variants written by public/files/precompress_assets.py, best first
+const ENCODINGS = [
+  { name: 'br', ext: '.br' },
+  { name: 'gzip', ext: '.gz' }
+];
+
+function acceptsEncoding(req, name) {
+  const header = req.headers['accept-encoding'] || '';
+  return header.split(',').some(part => {
+    const [coding, ...params] = part.trim().split(';');
+    const q = params.find(param => param.trim().startsWith('q='));
+    return coding.trim().toLowerCase() === name && (!q || parseFloat(q.trim().slice(2)) > 0);
+  });
+}
+
+// Pick an up-to-date precompressed variant the client accepts, if any.
+// Returns { variants, chosen } so the caller can set Vary even when none is used.
+function selectEncoding(req, filePath, stats) {
+  const relPath = toRelative(filePath);
+  const variants = ENCODINGS
+    .map(encoding => ({ ...encoding, stats: fileIndex.get(relPath + encoding.ext) }))
+    .filter(variant => variant.stats && variant.stats.mtimeMs >= stats.mtimeMs);
+  const chosen = variants.find(variant => acceptsEncoding(req, variant.name)) || null;
+  return { variants, chosen };
+}
+
+// Parse a single "bytes=" range. Returns null to ignore the header (serve the
+// whole file), -1 if unsatisfiable, or { start, end }.
+function parseRange(header, size) {
+  const match = /^bytes=(\d*)-(\d*)$/.exec((header || '').trim());
+  if (!match || (match[1] === '' && match[2] === '')) {
+    return null;
+  }
+
+  let start;
+  let end;
+  if (match[1] === '') {
+    // Suffix range: the last N bytes
+    start = Math.max(size - parseInt(match[2], 10), 0);
+    end = size - 1;
+  } else {
+    start = parseInt(match[1], 10);
+    end = match[2] === '' ? size - 1 : Math.min(parseInt(match[2], 10), size - 1);
+  }
+
+  if (start >= size || start > end) {
+    return -1;
+  }
+  return { start, end };
+}
+
+// If-Range: only honour the Range header if the client's copy is still current
+function rangeIsCurrent(req, etag, lastModified) {
+  const ifRange = req.headers['if-range'];
+  if (!ifRange) {
+    return true;
+  }
+  if (ifRange.startsWith('"') || ifRange.startsWith('W/')) {
+    // If-Range needs a strong match; weak validators never qualify
+    return !etag.startsWith('W/') && ifRange === etag;
+  }
+  return ifRange === lastModified;
+}
 
 // Endpoint to serve files
-app.get('/api/files/*', (req, res) => {
+app.get('/api/files/*', async (req, res) => {
   try {
     // Get the file path from the URL (everything after /api/files/)
     const requestedPath = req.params[0];
@@ -35,14 +286,13 @@ app.get('/api/files/*', (req, res) => {
       return res.status(403).json({ error: 'Access denied' });
     }
 
-    // Check if file exists
-    if (!fs.existsSync(filePath)) {
+    // Check if file exists (cached metadata, no blocking disk access)
+    const stats = await getFileStats(filePath);
+    if (!stats) {
       console.error('File not found:', filePath);
       return res.status(404).json({ error: 'File not found' });
     }
 
-    // Get file stats
-    const stats = fs.statSync(filePath);
     if (!stats.isFile()) {
       return res.status(400).json({ error: 'Not a file' });
     }
@@ -56,20 +306,88 @@ app.get('/api/files/*', (req, res) => {
       '.jpeg': 'image/jpeg',
       '.csv': 'text/csv',
       '.tex': 'text/plain',
-      '.txt': 'text/plain'
+      '.bib': 'text/plain',
+      '.txt': 'text/plain',
+      '.json': 'application/json',
+      '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     };
 
     const contentType = contentTypes[ext] || 'application/octet-stream';
     res.setHeader('Content-Type', contentType);
 
+    // Byte ranges apply to the identity file; compressed variants are only
+    // used for whole-file responses.
+    const rangeHeader = req.headers.range;
+    const { variants, chosen } = rangeHeader ? { variants: [], chosen: null } : selectEncoding(req, filePath, stats);
+    if (variants.length > 0) {
+      res.setHeader('Vary', 'Accept-Encoding');
+    }
+
+    // Cache validation from the asset manifest. URLs carrying the content hash
+    // (?v=<hash>) never change, so they can be cached for a year. Files the
+    // generators do not record (e.g. the LaTeX-built PDFs) get a weak
+    // validator from the cached stats instead.
+    const asset = getManifestEntry(filePath, stats);
+    // Each encoding is a different representation and needs its own ETag
+    const encodingSuffix = chosen ? `-${chosen.name}` : '';
+    let etag;
+    let mtime;
+    if (asset) {
+      etag = `"${asset.hash}${encodingSuffix}"`;
+      mtime = asset.mtime;
+      res.setHeader('Cache-Control', req.query.v === asset.hash
+        ? 'public, max-age=31536000, immutable'
+        : 'no-cache');
+    } else {
+      etag = `W/"${stats.size.toString(16)}-${Math.floor(stats.mtimeMs).toString(16)}${encodingSuffix}"`;
+      mtime = stats.mtimeMs;
+      res.setHeader('Cache-Control', 'no-cache');
+    }
+    const lastModified = new Date(mtime).toUTCString();
+    res.setHeader('ETag', etag);
+    res.setHeader('Last-Modified', lastModified);
+
+    if (isNotModified(req, etag, mtime)) {
+      return res.status(304).end();
+    }
+
     // Set headers for inline display (not download)
     res.setHeader('Content-Disposition', `inline; filename="${path.basename(filePath)}"`);
+    res.setHeader('Accept-Ranges', 'bytes');
+
+    const range = rangeHeader && rangeIsCurrent(req, etag, lastModified)
+      ? parseRange(rangeHeader, stats.size)
+      : null;
 
-    // Stream the file
-    const fileStream = fs.createReadStream(filePath);
+    if (range === -1) {
+      res.setHeader('Content-Range', `bytes */${stats.size}`);
+      return res.status(416).end();
+    }
+
+    // Stream the file (or the requested byte range / compressed variant)
+    let fileStream;
+    if (range) {
+      res.status(206);
+      res.setHeader('Content-Range', `bytes ${range.start}-${range.end}/${stats.size}`);
+      res.setHeader('Content-Length', range.end - range.start + 1);
+      fileStream = fs.createReadStream(filePath, { start: range.start, end: range.end });
+    } else if (chosen) {
+      res.setHeader('Content-Encoding', chosen.name);
+      res.setHeader('Content-Length', chosen.stats.size);
+      fileStream = fs.createReadStream(filePath + chosen.ext);
+    } else {
+      res.setHeader('Content-Length', stats.size);
+      fileStream = fs.createReadStream(filePath);
+    }
+
+    fileStream.on('error', error => {
+      console.error('Error streaming file:', error);
+      res.destroy(error);
+    });
     fileStream.pipe(res);
 
-    console.log('Serving file:', filePath, 'Type:', contentType);
+    console.log('Serving file:', filePath, 'Type:', contentType,
+      range ? `Range: ${range.start}-${range.end}` : '', chosen ? `Encoding: ${chosen.name}` : '');
 
   } catch (error) {
     console.error('Error serving file:', error);
@@ -78,7 +396,7 @@ app.get('/api/files/*', (req, res) => {
 });
 
 // Endpoint to download files (forces download instead of inline display)
-app.get('/api/download/*', (req, res) => {
+app.get('/api/download/*', async (req, res) => {
   try {
     const requestedPath = req.params[0];
     const filePath = path.join(RESEARCH_DIR, requestedPath);
@@ -89,7 +407,8 @@ app.get('/api/download/*', (req, res) => {
       return res.status(403).json({ error: 'Access denied' });
     }
 
-    if (!fs.existsSync(filePath)) {
+    const stats = await getFileStats(filePath);
+    if (!stats || !stats.isFile()) {
       return res.status(404).json({ error: 'File not found' });
     }
 
@@ -102,32 +421,66 @@ app.get('/api/download/*', (req, res) => {
   }
 });
 
-// List all files in the research directory (for debugging)
-app.get('/api/debug/structure', (req, res) => {
-  try {
-    const structure = {};
-
-    const folders = fs.readdirSync(RESEARCH_DIR);
-    folders.forEach(folder => {
-      const folderPath = path.join(RESEARCH_DIR, folder);
-      if (fs.statSync(folderPath).isDirectory()) {
-        const files = fs.readdirSync(folderPath);
-        structure[folder] = files;
+// Asset manifest for building hashed (immutable) file URLs: /api/files/<path>?v=<hash>
+app.get('/api/manifest', (req, res) => {
+  res.setHeader('Cache-Control', 'no-cache');
+  res.json(assetManifest);
+});
+
+// On-demand chart rendering, proxied to the Python render service
+// (public/files/render_service.py)
+const RENDER_SERVICE_URL = process.env.RENDER_SERVICE_URL || 'http://127.0.0.1:3002';
+
+function proxyToRenderService(req, res, servicePath) {
+  const target = new URL(servicePath, RENDER_SERVICE_URL);
+  for (const [key, value] of Object.entries(req.query)) {
+    target.searchParams.set(key, String(value));
+  }
+
+  const headers = {};
+  if (req.headers['if-none-match']) {
+    headers['If-None-Match'] = req.headers['if-none-match'];
+  }
+
+  const proxyReq = http.get(target, { headers }, proxyRes => {
+    res.status(proxyRes.statusCode);
+    ['content-type', 'content-length', 'etag', 'cache-control'].forEach(name => {
+      if (proxyRes.headers[name]) {
+        res.setHeader(name, proxyRes.headers[name]);
       }
     });
+    proxyRes.pipe(res);
+  });
 
-    res.json(structure);
-  } catch (error) {
-    res.status(500).json({ error: error.message });
-  }
+  proxyReq.on('error', error => {
+    console.error('Render service unavailable:', error.message);
+    if (!res.headersSent) {
+      res.status(502).json({ error: 'Render service unavailable' });
+    }
+  });
+}
+
+app.get('/api/charts', (req, res) => {
+  proxyToRenderService(req, res, '/charts');
+});
+
+app.get('/api/charts/:chartId', (req, res) => {
+  proxyToRenderService(req, res, `/render/${encodeURIComponent(req.params.chartId)}`);
+});
+
+// List all files in the research directory (for debugging)
+app.get('/api/debug/structure', (req, res) => {
+  // Precomputed from the metadata cache
+  res.json(structureCache);
 });
 
 // Health check endpoint
 app.get('/api/health', (req, res) => {
   res.json({
     status: 'ok',
-    researchDirExists: fs.existsSync(RESEARCH_DIR),
-    researchDir: RESEARCH_DIR
+    researchDirExists,
+    researchDir: RESEARCH_DIR,
+    indexedFiles: fileIndex.size
   });
 });
 
@@ -137,6 +490,8 @@ app.listen(PORT, () => {
   console.log(`\nAvailable endpoints:`);
   console.log(`  - GET /api/files/* - Serve files for preview`);
   console.log(`  - GET /api/download/* - Download files`);
+  console.log(`  - GET /api/manifest - Asset hashes for cacheable URLs`);
+  console.log(`  - GET /api/charts/:chartId - Render a chart on demand`);
   console.log(`  - GET /api/health - Health check`);
   console.log(`  - GET /api/debug/structure - View file structure\n`);
 });